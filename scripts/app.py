@@ -1,87 +1,132 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.colors as colors
 import os
-import numpy as np
-
-from plotly.subplots import make_subplots
+import uuid
+import plotly.io as pio
+
+from charts import PRICE_CATEGORIES, FigureCache
+import compute
+from compute import PERIODS, SteamData
+from watcher import DatasetWatcher
+import approx
+import figures
+from profiling import StageRecorder, stage
 # from ai.insight_engine import insight_distributiongame
 
 # Set page configuration
 st.set_page_config(page_title="Steam Dashboard", layout="wide")
 
+# Catatan waktu/baris/memori per tahap untuk rerun ini (juga ditulis sebagai
+# log JSON); tampil di sidebar bila URL memakai ?debug=1
+stage_recorder = StageRecorder(run_id=uuid.uuid4().hex[:8]).activate()
+DEBUG_PANEL = st.query_params.get('debug') == '1'
+
 # CSS Style
-kpi_style = """
-<style>
-.title {
-    font-size: 36px;
-    font-weight: 700;
-    color: #262730;
-}
-.kpi-box {
-    background: #F0F2F6;
-    padding: 12px;
-    border-radius: 12px;
-    text-align: center;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-    border-left: 4px solid #0068C9;
-    min-height: 150px;
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-}
-.kpi-value {
-    font-size: 32px;
-    font-weight: 700;
-    margin-bottom: -10px;
-    color: #0068C9;
-}
-.kpi-label {
-    font-size: 16px;
-    color: #262730;
-}
-.kpi-delta {
-    text: None;
-}
-.kpi-delta-pos {
-    display: inline-block;
-    font-size: 14px;
-    color: #37C900;
-    # background-color: #02FF20;
-}
-.kpi-delta-neg {
-    font-size: 14px;
-    color: #C90000;
-    # background-color: #FF4B4B;
-}
-</style>
-"""
-st.markdown(kpi_style, unsafe_allow_html=True)
+st.markdown(figures.KPI_STYLE, unsafe_allow_html=True)
 
 # Load data
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-# CSV di folder data di root repo
-DATA_PATH = os.path.join(BASE_DIR, "..", "data", "steam.csv")
-try:
-    df = pd.read_csv(DATA_PATH)
-except FileNotFoundError:
+# CSV di folder data di root repo (bisa diganti lewat STEAM_DASHBOARD_DATA)
+DATA_PATH = os.environ.get('STEAM_DASHBOARD_DATA', os.path.join(BASE_DIR, "..", "data", "steam.csv"))
+# 'stream': CSV dilipat per potongan ke agregat tanpa memuat tabel penuh
+# (untuk CSV yang lebih besar dari RAM); 'duckdb': query SQL langsung di
+# atas snapshot Parquet tanpa DataFrame penuh; default 'memory'
+INGEST_MODE = os.environ.get('STEAM_DASHBOARD_INGEST', 'memory')
+STREAM_CHUNK_ROWS = int(os.environ.get('STEAM_DASHBOARD_CHUNK_ROWS', 200_000))
+# Ukuran sampel mode perkiraan; data yang tidak lebih besar selalu eksak
+APPROX_SAMPLE_ROWS = int(os.environ.get('STEAM_DASHBOARD_APPROX_ROWS', approx.SAMPLE_ROWS))
+# Interval pemeriksaan steam.csv/delta oleh thread latar (detik)
+WATCH_POLL_SECONDS = float(os.environ.get('STEAM_DASHBOARD_POLL_SECONDS', 5))
+
+@st.cache_resource(show_spinner="Memuat data...")
+def get_watcher(path, mode, chunk_rows):
+    # Satu watcher per proses server. Versi pertama dimuat di sini (sekali);
+    # setelah itu steam.csv dan delta dipantau thread latar, jadi rerun
+    # tidak pernah ikut menunggu parse/preprocess ulang
+    return DatasetWatcher(path, mode, chunk_rows, poll_seconds=WATCH_POLL_SECONDS).start()
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    # Satu cache per proses server, dipakai bersama semua session
+    return FigureCache(max_bytes=64 * 1024 * 1024)
+
+
+def cached_figure(name, *key, build):
+    # Figure adalah fungsi murni dari (versi data, filter); build() hanya
+    # dipanggil saat miss, selain itu pakai JSON yang sudah jadi
+    def timed_build():
+        with stage(f'build_figure[{name}]'):
+            return build()
+
+    # key selalu diawali (start, end) periode; versinya hanya berubah bila
+    # ada delta yang menyentuh tahun di periode itu
+    fig_json = get_figure_cache().get_or_build((name, *period_version(key[0], key[1]), *key), timed_build)
+    with stage(f'from_json[{name}]'):
+        return pio.from_json(fig_json)
+
+
+def render_figure(name, *key, build):
+    fig = cached_figure(name, *key, build=build)
+    with stage(f'plotly_chart[{name}]'):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def period_version(start, end):
+    return data_version, steam_data.range_version(start, end)
+
+
+@st.cache_resource(max_entries=1, show_spinner="Menyiapkan sampel...")
+def load_sample(_data, version):
+    # Sampel berstrata untuk mode perkiraan; dibangun ulang bila ada delta
+    return approx.StratifiedSample.build(_data.df, APPROX_SAMPLE_ROWS).freeze()
+
+
+# _data tidak ikut di-hash Streamlit; kuncinya versi periode + filter.
+# Hasil selalu diakhiri galat 95% (0 untuk mode eksak)
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_density_bins(_data, version, start, end, price_category, approximate):
+    # Di-bin di server per (periode, kategori harga); browser hanya menerima
+    # matriks 40x40, bukan seluruh titik
+    if approximate:
+        sample = load_sample(_data, period_version(None, None))
+        return approx.density(_data, sample, start, end, price_category, nbins=40)
+    return (*_data.density(start, end, price_category, nbins=40), 0.0)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_owner_genres(_data, version, start, end):
+    return _data.owner_genres(start, end)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_owner_points(_data, version, start, end, genre, approximate):
+    if approximate:
+        sample = load_sample(_data, period_version(None, None))
+        return approx.owner_points(_data, sample, start, end, genre)
+    result = _data.owner_points(start, end, genre)
+    return (*result, result[3], 0.0)
+
+
+if not os.path.exists(DATA_PATH):
     st.error(f"File CSV tidak ditemukan di path: {DATA_PATH}")
     st.stop()
 
-# Preprocess data
-df['release_date'] = pd.to_datetime(df['release_date'], errors='coerce')
-df['release_year'] = df['release_date'].dt.year
+# Versi diambil sekali per rerun: bila watcher menukar dataset di tengah
+# rerun, rerun ini tetap memakai versi lama sampai selesai. Index
+# genre/publisher (CSR), cube per tahun dan bitmap read-only dan dibagi
+# semua session; tiap session hanya menyimpan mask dan agregat kecil
+with stage('load_steam_data'):
+    dataset = get_watcher(DATA_PATH, INGEST_MODE, STREAM_CHUNK_ROWS).current()
+data_version = dataset.version
+steam_data = dataset.data
+dimensions = steam_data.dimensions
+year_cube = steam_data.cube
 
 # Sidebar filters 
 st.sidebar.header('Filter Data') 
-period_options = [ 
-    'Semua', 
-    '5 Tahun Terakhir', 
-    '2010s (2010 - 2019)', 
-    '2000s (2000 - 2009)' 
-] 
+CUSTOM_PERIOD = 'Rentang Tahun (Kustom)'
+period_options = list(PERIODS) + [CUSTOM_PERIOD]
 
 time_period = st.sidebar.selectbox( 
     'Periode Waktu:', 
@@ -90,41 +135,42 @@ time_period = st.sidebar.selectbox(
 )
 
 # Filter utama berdasarkan time_period
-if time_period == 'Semua':
-    df_current = df
-    df_prev = None
-elif time_period == '5 Tahun Terakhir':
-    df_current = df[df['release_year'] >= 2014]
-    df_prev = df[(df['release_year'] >= 2009) & (df['release_year'] <= 2013)]
-elif time_period == '2010s (2010 - 2019)':
-    df_current = df[(df['release_year'] >= 2010) & (df['release_year'] <= 2019)]
-    df_prev = df[(df['release_year'] >= 2000) & (df['release_year'] <= 2009)]
-elif time_period == '2000s (2000 - 2009)':
-    df_current = df[(df['release_year'] <= 2009)]
-    df_prev = df[df['release_year'] < 2000]
-
-# ----- PREPROCESS GENRES -----
-df_current['genres'] = df_current['genres'].fillna('Unknown').str.split(';')
-df_current['genres'] = df_current['genres'].apply(
-    lambda x: [g.strip() for g in x if g.strip() and g.strip().lower() != 'indie']
-)
-
-df_exploded_genre = df_current.explode('genres')
-df_exploded_genre = df_exploded_genre[
-    df_exploded_genre['genres'].notna() & (df_exploded_genre['genres'] != "")
-]
-
-# ----- PREPROCESS PUBLISHER -----
-df_exploded_publisher = df_current.copy()
-df_exploded_publisher['publisher'] = df_exploded_publisher['publisher'].fillna('Unknown').str.split(';')
-df_exploded_publisher['publisher'] = df_exploded_publisher['publisher'].apply(
-    lambda x: [p.strip() for p in x]
-)
+with stage('period_windows'):
+    if time_period == CUSTOM_PERIOD:
+        if year_cube.first_year >= year_cube.last_year:
+            # Semua tahun rilis yang diketahui sama (atau tidak ada): slider
+            # butuh min < max, jadi pakai jendela satu tahun
+            current_start = current_end = year_cube.first_year
+            st.sidebar.caption(f"Rentang Tahun: {current_start} (hanya satu tahun)")
+        else:
+            current_start, current_end = st.sidebar.slider(
+                'Rentang Tahun:',
+                min_value=year_cube.first_year,
+                max_value=year_cube.last_year,
+                value=(max(year_cube.first_year, year_cube.last_year - 4), year_cube.last_year),
+            )
+        # Pembanding: jendela sama panjang tepat sebelum rentang terpilih
+        prev_range = compute.previous_range(current_start, current_end)
+        current = year_cube.window(current_start, current_end)
+        prev = year_cube.window(*prev_range)
+    else:
+        current_start, current_end, current, prev = compute.preset_windows(year_cube, time_period)
+
+# Mode perkiraan: heatmap dan Scatterpolar dari sampel berstrata. KPI dan
+# Top-N tetap eksak (cube). Data kecil atau mode streaming/duckdb selalu eksak
+approx_available = isinstance(steam_data, SteamData) and len(steam_data.df) > APPROX_SAMPLE_ROWS
+approx_mode = st.sidebar.toggle(
+    'Mode Cepat (Perkiraan)',
+    value=False,
+    disabled=not approx_available,
+    help=(
+        f"Heatmap dan sebaran owners dihitung dari sampel ±{APPROX_SAMPLE_ROWS:,} game"
+        if approx_available else "Data kecil atau mode streaming/duckdb: semua grafik dihitung eksak"
+    ),
+) and approx_available
 
-df_exploded_publisher = df_exploded_publisher.explode('publisher')
-df_exploded_publisher = df_exploded_publisher[
-    df_exploded_publisher['publisher'].notna() & (df_exploded_publisher['publisher'] != "")
-]
+# Kunci cache figure untuk periode ini ('Semua' juga menghitung tahun kosong)
+period_key = (current_start, current_end, time_period == 'Semua')
 
 # Title and description
 st.markdown("""
@@ -140,271 +186,54 @@ Dibuat oleh **Cognito Team.**
 st.markdown("---")
 
 #KPI Cards
-total_games = df_current.shape[0]
-
-if df_exploded_genre.empty:
-    most_common_genre = "Unknown"
-else:
-    most_common_genre = df_exploded_genre['genres'].mode()[0]
-
-if df_exploded_publisher.empty:
-    most_common_publisher = "Unknown"
-else:
-    publisher_mean_rating = (
-        df_exploded_publisher.groupby('publisher')['positive_ratings']
-        .mean()
-        .reset_index()
-        .sort_values(by='positive_ratings', ascending=False)
-    )
-    most_common_publisher = publisher_mean_rating.iloc[0]['publisher']
-
-avg_price_current = df_current['price'].mean()
-
-#Logical Delta Absence for Time Period
-if df_prev is not None and len(df_prev) > 0:
-    total_games_prev = df_prev.shape[0]
-    delta_games = total_games - total_games_prev
-    #Price
-    avg_price_prev = df_prev['price'].mean()
-    delta_price_abs = avg_price_current - avg_price_prev
-    delta_price_pct = (delta_price_abs / avg_price_prev) * 100
-else:
-    delta_games = None
-    delta_price_abs = None
-    delta_price_pct = None
-
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    if delta_games is not None:
-        st.markdown(f"""
-            <div class="kpi-box">
-                <div class="kpi-label">Total Games</div>
-                <div class="kpi-value">
-                    {total_games:,}
-                    <span class="{ 'kpi-delta-pos' if delta_games >= 0 else 'kpi-delta-neg' }">
-                        {delta_games:+,}
-                    </span>
-                </div>
-                <div style="color: #3B3B3B; margin-top: 4px; font-size: 14px">Periode Sebelumnya</div>
-            </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-            <div class="kpi-box">
-                <div class="kpi-label">Total Games</div>
-                <div class="kpi-value">{total_games:,}</div>
-                <div class="kpi-delta"></div>
-            </div>
-        """, unsafe_allow_html=True)
-with col2:
-    # st.markdown(f"""
-    #     <div class="kpi-box">
-    #         <div class="kpi-label">Total Publisher</div>
-    #         <div class="kpi-value">{total_publishers:,}</div>
-    #     </div>
-    # """, unsafe_allow_html=True)
-    st.markdown(f"""
-        <div class="kpi-box">
-            <div class="kpi-label">Publisher Terfavorit</div>
-            <div class="kpi-value">{most_common_publisher}</div>
-        </div>
-    """, unsafe_allow_html=True)
-with col3:
-    st.markdown(f"""
-        <div class="kpi-box">
-            <div class="kpi-label">Genre Terpopuler</div>
-            <div class="kpi-value">{most_common_genre}</div>
-        </div>
-    """, unsafe_allow_html=True)
-with col4:
-    if delta_price_abs is not None:
-        st.markdown(f"""
-            <div class="kpi-box">
-                <div class="kpi-label">Harga Rata-rata</div>
-                <div class="kpi-value">
-                    £{avg_price_current:.2f}
-                    <span class="{ 'kpi-delta-neg' if delta_price_abs >= 0 else 'kpi-delta-pos' }">
-                    {delta_price_abs:+.2f}£ ({delta_price_pct:+.1f}%)
-                    </span>
-                </div>
-                <div style="color: #3B3B3B; margin-top: 4px; font-size: 14px">Periode Sebelumnya</div>
-            </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-            <div class="kpi-box">
-                <div class="kpi-label">Harga Rata-rata</div>
-                <div class="kpi-value">£{avg_price_current:.2f}</div>
-                <div class="kpi-delta"></div>
-            </div>
-        """, unsafe_allow_html=True)
+with stage('kpis'):
+    kpi = compute.kpis(dimensions, current, prev)
+
+# KPI selalu eksak dari cube; di mode perkiraan galatnya ditulis eksplisit
+kpi_error = '<div class="kpi-error">galat ±0 (eksak)</div>' if approx_mode else ''
+
+for col, card in zip(st.columns(4), figures.kpi_cards(kpi, kpi_error)):
+    with col:
+        st.markdown(card, unsafe_allow_html=True)
 
 st.markdown("---")
 
 #Trend Game of Release per Year
 st.subheader("Tren Perilisan Game per Tahun")
-games_per_year = df_current.groupby('release_year').size().reset_index(name='count')
-fig1 = px.line(
-    games_per_year,
-    x='release_year',
-    y='count',
-    markers=True,
-    color_discrete_map={'count': '#0068C9'},
-    labels={'release_year': 'Tahun Rilis', 'count': 'Jumlah Game'},
-    line_shape='spline'
-)
-fig1.update_traces(line_color='royalblue', line_width=3)
-fig1.update_layout(
-    template='plotly_white',
-    xaxis=dict(tickmode='linear', tick0=1990, dtick=2),
-    yaxis_title='Jumlah Game Dirilis',
-    hovermode='x unified'
-)
-st.plotly_chart(fig1, use_container_width=True)
+def build_fig1():
+    return figures.fig1(year_cube.games_per_year(current_start, current_end))
+render_figure('fig1', *period_key, build=build_fig1)
 
 # Top 5 Games by Reviews and 5 Genres Distribution
 col1, col2 = st.columns(2)
 with col1:
     st.subheader("Top 5 Game Terpopuler")
-    top5_games = df_current.nlargest(5, 'positive_ratings')[['name', 'positive_ratings', 'negative_ratings']]
-    top5_games_melted = top5_games.melt(id_vars='name', value_vars=['positive_ratings', 'negative_ratings'],
-                                        var_name='review_type', value_name='count')
-    fig2 = px.bar(
-        top5_games_melted,
-        x='name',
-        y='count',
-        color='review_type',
-        barmode='group',
-        labels={'name': 'Nama Game', 'count': 'Jumlah Review', 'review_type': 'Tipe Review'},
-        color_discrete_map={'positive_ratings': '#0068C9', 'negative_ratings': '#64B5F6'}
-    )
-    fig2.update_layout(
-        template='plotly_white',
-        xaxis_title='Nama Game',
-        yaxis_title='Jumlah Review',
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    def build_fig2():
+        return figures.fig2(steam_data.top_games(current_start, current_end, n=5))
+    render_figure('fig2', *period_key, build=build_fig2)
 with col2:
     st.subheader("Top 5 Genre Tepopuler")
-    df_genre = df_exploded_genre.copy()
-
-    # Hitung Top 5 Genre
-    top5_genres = (
-        df_genre['genres']
-        .value_counts()
-        .nlargest(5)
-        .reset_index()
-    )
-    top5_genres.columns = ['genre', 'count']
-
-    fig3 = px.bar(
-        top5_genres,
-        x='genre',
-        y='count',
-        labels={'genre': 'Genre', 'count': 'Jumlah Game'},
-        color='genre',
-        color_discrete_map={
-            top5_genres['genre'][0]: '#0068C9',
-            top5_genres['genre'][1]: '#3286d3',
-            top5_genres['genre'][2]: '#66a4de',
-            top5_genres['genre'][3]: '#99c2e9',
-            top5_genres['genre'][4]: '#e5eff9',
-        }
-    )
-
-    fig3.update_layout(
-        template='plotly_white',
-        xaxis_title='Genre',
-        yaxis_title='Jumlah Game',
-        hovermode='x unified'
-    )
-
-    st.plotly_chart(fig3, use_container_width=True)
+    def build_fig3():
+        # Hitung Top 5 Genre
+        return figures.fig3(compute.top_genres(dimensions, current, n=5))
+    render_figure('fig3', *period_key, build=build_fig3)
 
 # Top 5 Publishers by Average Positive Reviews and Price Distribution (Free vs Paid)
 col1, col2 = st.columns(2)
 with col1:
     st.subheader("Top 5 Publisher Terfavorit")
-    def clean_publisher(x):
-        if isinstance(x, float) or x is None:
-            return ['Unknown']
-        if isinstance(x, str):
-            return [p.strip() for p in x.split(';') if p.strip() != ""]
-        if isinstance(x, list):
-            return [p.strip() for p in x if isinstance(p, str) and p.strip() != ""]
-        return ['Unknown']
-
-    # --- Copy df_current agar aman ---
-    df_pub = df_current.copy()
-
-    # --- Bersihkan dan explode publisher ---
-    df_pub['publisher'] = df_pub['publisher'].apply(clean_publisher)
-    df_pub = df_pub.explode('publisher')
-
-    # --- Drop kosong (jaga-jaga) ---
-    df_pub = df_pub[df_pub['publisher'].notna() & (df_pub['publisher'] != "")]
-
-    # --- Cek jika dataframe kosong ---
-    if df_pub.empty:
+    if not (current.publisher_games > 0).any():
         st.write("Tidak ada data publisher tersedia.")
-    else:
-        # --- Hitung rata-rata review positif per publisher ---
-        avg_positive_reviews = (
-            df_pub.groupby('publisher')['positive_ratings']
-            .mean()
-            .reset_index()
-        )
-
-    # --- Ambil Top 5 ---
-    top5_publishers = (
-        avg_positive_reviews
-        .nlargest(5, 'positive_ratings')
-        .reset_index(drop=True)
-    )
 
-    # --- Plot bar chart ---
-    fig4 = px.bar(
-        top5_publishers,
-        x='publisher',
-        y='positive_ratings',
-        labels={'publisher': 'Publisher', 'positive_ratings': 'Rata-rata Review Positif'},
-        color='publisher',
-        color_discrete_map={
-            top5_publishers['publisher'][0]: '#0068C9',
-            top5_publishers['publisher'][1]: '#3286d3',
-            top5_publishers['publisher'][2]: '#66a4de',
-            top5_publishers['publisher'][3]: '#99c2e9',
-            top5_publishers['publisher'][4]: '#e5eff9',
-        }
-    )
-    fig4.update_layout(
-        template='plotly_white',
-        xaxis_title='Publisher',
-        yaxis_title='Rata-rata Review Positif',
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig4, use_container_width=True)
+    def build_fig4():
+        # Top 5 (rata-rata review positif per publisher)
+        return figures.fig4(compute.top_publishers(dimensions, current, n=5))
+    render_figure('fig4', *period_key, build=build_fig4)
 with col2:
     st.subheader("Distribusi Harga Game (Gratis vs Berbayar)")
-    df_current['price_category'] = np.where(df_current['price'] == 0, 'Gratis', 'Berbayar')
-    price_distribution = df_current['price_category'].value_counts().reset_index()
-    price_distribution.columns = ['price_category', 'count']
-    fig5 = px.pie(
-        price_distribution,
-        names='price_category',
-        values='count',
-        color='price_category',
-        color_discrete_map={'Gratis': '#64B5F6', 'Berbayar': '#0068C9'},
-    )
-    fig5.update_traces(
-        pull=[0 if cat == 'Gratis' else 0.1 for cat in price_distribution['price_category']]
-    )
-    fig5.update_layout(
-        template='plotly_white',
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig5, use_container_width=True)
+    def build_fig5():
+        return figures.fig5(compute.price_distribution(current))
+    render_figure('fig5', *period_key, build=build_fig5)
 
     # Insight Dropdown for Price Distribution
     # with st.expander("💡 Insight"):
@@ -492,52 +321,31 @@ st.markdown("---")
 # st.markdown("---")
 
 # Density Game by Ratio Positive Reviews and Price Game with Filter Price Category
-st.subheader("Distribusi Game Berdasarkan Rasio Review Positif dan Harga Game")
-df_density = df_current.copy()
-df_density['positive_ratio'] = df_density['positive_ratings'] / (
-    df_density['positive_ratings'] + df_density['negative_ratings']
-)
+# Fragment: ganti 'Pilih Kategori Harga' hanya menjalankan ulang bagian ini
+@st.fragment
+def density_section(start, end, approximate):
+    st.subheader("Distribusi Game Berdasarkan Rasio Review Positif dan Harga Game")
+    col1, col2, col3, col4 = st.columns(4)
+    with col4:
+        price_category_options = list(PRICE_CATEGORIES)
+        selected_price_category = st.selectbox(
+            'Pilih Kategori Harga:',
+            price_category_options,
+            index=0
+        )
 
-col1, col2, col3, col4 = st.columns(4)
-with col4:
-    price_category_options = ['Semua', 'Gratis', 'Murah (0-£10)', 'Sedang (£10-£30)', 'Mahal (£30-£100)', 'Premium (£100+)']
-    selected_price_category = st.selectbox(
-        'Pilih Kategori Harga:',
-        price_category_options,
-        index=0
+    density_x, density_y, density_z, density_error = load_density_bins(
+        steam_data, period_version(start, end), start, end, selected_price_category, approximate
     )
-if selected_price_category == 'Gratis':
-    df_density = df_density[df_density['price'] == 0]
-elif selected_price_category == 'Murah (0-£10)':
-    df_density = df_density[(df_density['price'] > 0) & (df_density['price'] <= 10)]
-elif selected_price_category == 'Sedang (£10-£30)':
-    df_density = df_density[(df_density['price'] > 10) & (df_density['price'] <= 30)]
-elif selected_price_category == 'Mahal (£30-£100)':
-    df_density = df_density[(df_density['price'] > 30) & (df_density['price'] <= 100)]
-elif selected_price_category == 'Premium (£100+)':
-    df_density = df_density[df_density['price'] > 100]
-
-fig7 = px.density_heatmap(
-    df_density,
-    x='positive_ratio',
-    y='price',
-    nbinsx=40,
-    nbinsy=40,
-    color_continuous_scale='Blues',
-    labels={
-        'positive_ratio': 'Persentase Ulasan Positif',
-        'price': 'Harga (£)'
-    },
-    width=1100,
-    height=650
-)
-fig7.update_layout(
-    template='plotly_white',
-    xaxis_title='Persentase Ulasan Positif',
-    yaxis_title='Harga (£)',
-    
-)
-st.plotly_chart(fig7, use_container_width=True)
+
+    def build_fig7():
+        return figures.fig7(density_x, density_y, density_z)
+    render_figure('fig7', start, end, selected_price_category, approximate, build=build_fig7)
+    if approximate:
+        st.caption(f"Perkiraan dari sampel berstrata; galat tiap sel ±{density_error:,.0f} game (95%)")
+
+
+density_section(current_start, current_end, approx_mode)
 
 st.markdown("---")
 
@@ -687,83 +495,46 @@ st.markdown("---")
 # st.plotly_chart(fig7, use_container_width=True)
 
 #Corelation Owner (Players) vs Average Playtime with Filter Genre use Scatter Polar Plot
-st.subheader("Sebaran Jumlah Pemain (Owners) terhadap Rata-rata Durasi Bermain")
-df_owner = df_current.copy()
-def convert_owner_range(x):
-    x = str(x).replace(',', '').replace('+', '')
-    if '-' in x:
-        a, b = x.split('-')
-        return (float(a) + float(b)) / 2
-    return float(x)
-
-df_owner['owners'] = df_owner['owners'].apply(convert_owner_range)
-df_owner['owners'] = df_owner['owners'].fillna(df_owner['owners'].mean())
-
-df_owner['genres'] = (
-    df_owner['genres']
-    .fillna('Unknown')
-    .apply(lambda x: x.split(';') if isinstance(x, str) else x)
-)
-df_owner['genres'] = df_owner['genres'].apply(
-    lambda x: [g.strip() for g in x] if isinstance(x, list) else ['Unknown']
-)
-
-df_owner = df_owner.explode('genres')
-df_owner = df_owner[df_owner['genres'].str.lower() != 'indie']
-df_owner['genres'] = df_owner['genres'].replace('', 'Unknown')
-
-col1, col2, col3, col4 = st.columns(4)
-with col4:
-    df_owner['genres'] = df_owner['genres'].astype(str)
-    genre_options_owner = ['Semua'] + sorted(df_owner['genres'].unique().tolist())
-    selected_genre_owner = st.selectbox('Pilih Genre:', genre_options_owner, index=0)
-
-if selected_genre_owner != 'Semua':
-    df_owner = df_owner[df_owner['genres'] == selected_genre_owner]
-df_owner = df_owner.dropna(subset=['owners', 'average_playtime'])
+# Fragment: ganti 'Pilih Genre' hanya menjalankan ulang bagian ini
+@st.fragment
+def owner_section(start, end, approximate):
+    st.subheader("Sebaran Jumlah Pemain (Owners) terhadap Rata-rata Durasi Bermain")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col4:
+        genre_options_owner = ['Semua'] + load_owner_genres(steam_data, period_version(start, end), start, end)
+        selected_genre_owner = st.selectbox('Pilih Genre:', genre_options_owner, index=0)
+
+    df_owner, df_owner_bins, genre_map, n_points, n_estimate, owner_error = load_owner_points(
+        steam_data, period_version(start, end), start, end, selected_genre_owner, approximate
+    )
 
-genres = sorted(df_owner['genres'].unique())
-genre_map = {g: i * 360 / len(genres) for i, g in enumerate(genres)}
-df_owner['theta'] = df_owner['genres'].map(genre_map)
+    def build_fig8():
+        return figures.fig8(df_owner, df_owner_bins, genre_map, n_points)
 
-df_owner['owners_scaled'] = df_owner['owners']
+    render_figure('fig8', start, end, selected_genre_owner, approximate, build=build_fig8)
+    if approximate:
+        st.caption(
+            f"Perkiraan: {n_points:,} titik sampel mewakili ±{n_estimate:,} titik "
+            f"(galat ±{owner_error:,.0f}, 95%)"
+        )
 
-df_owner['marker_size'] = (df_owner['average_playtime'] / 60).clip(5, 20)
 
-fig8 = go.Figure()
+owner_section(current_start, current_end, approx_mode)
 
-fig8.add_trace(go.Scatterpolar(
-    r=df_owner['owners_scaled'],
-    theta=df_owner['theta'],
-    mode='markers',
-    marker=dict(
-        size=df_owner['marker_size'],
-        color=df_owner['owners_scaled'],
-        colorscale='RdBu',
-        showscale=True,
-        colorbar=dict(title='Jumlah Pemain')
-    ),
-    hovertemplate=(
-        "<b>%{text}</b><br>"
-        "Genre: %{customdata[1]}<br>"
-        "Jumlah Owner: %{r}<br>"
-        "Rata-rata Playtime: %{marker.size} menit<br>"
-        "Publisher: %{customdata[0]}<extra></extra>"
-    ),
-    text=df_owner['name'],
-    customdata=df_owner[['publisher', 'genres']]
-))
-fig8.update_layout(
-    template='seaborn',
-    polar=dict(
-        radialaxis=dict(type='log'),
-        angularaxis=dict(
-            tickmode='array',
-            tickvals=list(genre_map.values()),
-            ticktext=list(genre_map.keys())
+if DEBUG_PANEL:
+    with st.sidebar.expander("Debug: waktu per tahap", expanded=True):
+        st.dataframe(
+            pd.DataFrame(stage_recorder.stages, columns=['stage', 'seconds', 'rows', 'mem_delta_mb'])
+            .astype({'rows': 'Int64'}),
+            hide_index=True
         )
-    ),
-    showlegend=False
-)
-
-st.plotly_chart(fig8, use_container_width=True)
\ No newline at end of file
+        st.caption(f"Total {sum(r['seconds'] for r in stage_recorder.stages):.3f} detik")
+        st.json(get_figure_cache().stats(), expanded=False)
+        st.json(get_watcher(DATA_PATH, INGEST_MODE, STREAM_CHUNK_ROWS).stats(), expanded=False)
+        # Data bersama tidak boleh berubah oleh session mana pun
+        with stage('verify_shared'):
+            if steam_data.is_unchanged():
+                st.caption("Data bersama utuh (fingerprint cocok)")
+            else:
+                st.error("Data bersama berubah sejak dimuat!")
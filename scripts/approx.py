@@ -0,0 +1,121 @@
+"""Mode perkiraan untuk katalog sangat besar: sampel berstrata per tahun rilis.
+
+KPI, Top-N genre/publisher/game dan distribusi harga sudah eksak dari cube
+dan sketch per tahun (biayanya tidak bergantung jumlah baris), jadi yang
+diperkirakan hanya bagian yang masih O(baris): heatmap densitas dan
+Scatterpolar owners. Tiap baris ikut sampel dengan peluang ``p`` strata
+(tahun rilis)-nya; jumlah diperkirakan sebagai jumlah bobot ``1/p``
+(Horvitz-Thompson) dengan galat 95% = 1.96 * sqrt(sum(w * (w - 1))).
+Data yang tidak lebih besar dari ``sample_rows`` diambil seluruhnya
+(p = 1), jadi hasilnya sama dengan mode eksak dan galatnya nol.
+"""
+import numpy as np
+
+from bitmap import popcount
+from charts import density_bins, positive_ratio
+from compute import owner_points as exact_owner_points
+from cube import YearTopK
+from profiling import stage
+
+SAMPLE_ROWS = 200_000
+# Tahun dengan sedikit game diambil paling sedikit sebanyak ini (atau
+# seluruhnya), supaya periode pendek tetap punya cukup titik
+MIN_STRATUM_ROWS = 2_000
+Z_95 = 1.96
+
+
+def _unit_hash(appid):
+    """appid -> bilangan seragam [0, 1) (splitmix64).
+
+    Keanggotaan sampel bergantung appid, bukan posisi baris, jadi game yang
+    sama tetap (tidak) terpilih setelah delta atau build ulang.
+    """
+    x = np.asarray(appid).astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class StratifiedSample:
+    """Bitset baris sampel plus bobot ``1/p`` per tahun rilis."""
+
+    def __init__(self, bits, first_key, weights):
+        self.bits = bits
+        self.first_key = first_key  # tahun (atau UNKNOWN_YEAR) untuk weights[0]
+        self.weights = weights
+
+    @classmethod
+    def build(cls, df, sample_rows=SAMPLE_ROWS):
+        with stage('build_sample', rows=len(df)):
+            keys = YearTopK.year_keys(df['release_year'].to_numpy())
+            first_key = int(keys.min()) if len(keys) else 0
+            strata = np.bincount(keys - first_key)
+            with np.errstate(divide='ignore'):
+                rate = np.maximum(sample_rows / max(len(df), 1), MIN_STRATUM_ROWS / strata)
+            # p = 1/k dengan k bulat: bobot tiap baris sampel bilangan bulat,
+            # jadi bisa dipakai langsung sebagai jumlah game (owner_bands)
+            rate = 1 / np.ceil(1 / np.minimum(rate, 1.0))
+            take = _unit_hash(df['appid'].to_numpy()) < rate[keys - first_key]
+            return cls(np.packbits(take), first_key, 1 / rate)
+
+    def freeze(self):
+        self.bits.flags.writeable = False
+        self.weights.flags.writeable = False
+        return self
+
+    @property
+    def size(self):
+        return popcount(self.bits)
+
+    def weights_for(self, df, rows):
+        keys = YearTopK.year_keys(df['release_year'].to_numpy()[rows])
+        return self.weights[keys - self.first_key]
+
+    def select(self, df, bits):
+        """(mask, posisi, bobot) baris sampel di dalam bitset ``bits``."""
+        mask = np.unpackbits(bits & self.bits, count=len(df)).view(bool)
+        rows = np.flatnonzero(mask)
+        return mask, rows, self.weights_for(df, rows)
+
+
+def bound(weights, sizes=1):
+    """Setengah lebar selang 95% untuk jumlah ``weights * sizes``.
+
+    ``sizes`` = jumlah titik per baris sampel (game multi-genre ikut
+    terpilih atau tidak sekaligus).
+    """
+    return Z_95 * float(np.sqrt(np.sum(weights * (weights - 1) * np.square(sizes))))
+
+
+def density(data, sample, start, end, price_category, nbins=40):
+    """Seperti ``SteamData.density`` dari sampel; + galat 95% sel terbesar."""
+    df = data.df
+    with stage('approx_density') as rec:
+        _, rows, weights = sample.select(df, data.bitmaps.select(start, end, prices=price_category))
+        rec['rows'] = len(rows)
+        ratio = positive_ratio(df, rows)
+        price = df['price'].to_numpy()[rows].astype(np.float64)
+        x, y, z = density_bins(ratio, price, nbins, nbins, weights=weights)
+        _, _, variance = density_bins(ratio, price, nbins, nbins, weights=weights * (weights - 1))
+        return x, y, z, Z_95 * float(np.sqrt(variance.max())) if variance.size else 0.0
+
+
+def owner_points(data, sample, start, end, genre='Semua'):
+    """Seperti ``SteamData.owner_points`` dari sampel.
+
+    Hasil: (..., perkiraan jumlah titik, galat 95%-nya).
+    """
+    mask, _, _ = sample.select(data.df, data.bitmaps.select(start, end))
+
+    def row_weights(rows):
+        return sample.weights_for(data.df, rows)
+
+    result = exact_owner_points(data.df, data.dimensions, mask, genre, row_weights=row_weights)
+    genre_index = data.dimensions['genres']
+    rows, codes = genre_index.entries(mask)
+    if genre != 'Semua':
+        rows = rows[codes == genre_index.code_of(genre)]
+    rows, sizes = np.unique(rows, return_counts=True)
+    weights = row_weights(rows)
+    return (*result, int(np.rint(np.sum(weights * sizes))), bound(weights, sizes))
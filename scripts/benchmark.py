@@ -0,0 +1,184 @@
+"""Benchmark tahap-tahap dashboard pada data sintetis berskema steam.csv.
+
+Contoh:
+    python scripts/benchmark.py                       # 30k, 1M, 10M baris
+    python scripts/benchmark.py --rows 30000 --json hasil.json
+
+Data sintetis disimpan di --data-dir dan dipakai ulang antar run, karena
+menulis CSV 10M baris sendiri butuh beberapa menit.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import approx
+import compute
+import ingest
+from compute import PERIODS, SteamData
+from charts import PRICE_CATEGORIES
+from cube import year_mask
+from dimensions import build_dimensions
+from streaming import StreamingData
+
+GENRES = [
+    'Action', 'Indie', 'Adventure', 'Casual', 'Strategy', 'RPG', 'Simulation',
+    'Sports', 'Racing', 'Free to Play', 'Early Access', 'Massively Multiplayer',
+    'Violent', 'Gore', 'Nudity', 'Sexual Content', 'Education', 'Utilities',
+]
+OWNER_RANGES = [
+    '0-20000', '20000-50000', '50000-100000', '100000-200000', '200000-500000',
+    '500000-1000000', '1000000-2000000', '2000000-5000000', '5000000-10000000',
+    '10000000-20000000', '20000000-50000000', '50000000-100000000',
+]
+OWNER_WEIGHTS = np.array([64, 12, 7, 5, 4, 3, 2, 1.2, 0.6, 0.3, 0.1, 0.05])
+
+
+def synthetic_steam(n_rows, seed=0):
+    """DataFrame sintetis dengan kolom dan format yang sama dengan steam.csv."""
+    rng = np.random.default_rng(seed)
+
+    # Kombinasi genre/publisher diambil dari pool string, seperti data asli
+    # yang nilainya banyak berulang; dibuat vektor supaya 10M baris tetap cepat
+    genre_pool = np.array([
+        ';'.join(rng.choice(GENRES, size=rng.integers(1, 5), replace=False))
+        for _ in range(2_000)
+    ], dtype=object)
+    n_publishers = max(100, n_rows // 10)
+    publishers = pd.Series(np.arange(n_publishers)).astype(str).radd('Publisher ').to_numpy(dtype=object)
+    primary = publishers[rng.zipf(1.3, n_rows) % n_publishers]
+    secondary = publishers[rng.integers(0, n_publishers, n_rows)]
+    has_secondary = rng.random(n_rows) < 0.15
+    publisher = pd.Series(primary).where(~has_secondary, pd.Series(primary) + ';' + pd.Series(secondary))
+    publisher[rng.random(n_rows) < 0.002] = np.nan
+
+    days = rng.integers(0, (pd.Timestamp('2019-05-01') - pd.Timestamp('1997-06-30')).days, n_rows)
+    release_date = pd.Timestamp('1997-06-30') + pd.to_timedelta(np.sort(days), unit='D')
+
+    positive = (rng.pareto(1.2, n_rows) * 50).astype(np.int64).clip(0, 3_000_000)
+    negative = (positive * rng.beta(2, 8, n_rows)).astype(np.int64)
+    price = rng.choice([0, 0.79, 0.99, 2.99, 4.99, 7.19, 9.99, 14.99, 19.99, 29.99, 49.99, 119.99], n_rows,
+                       p=[0.09, 0.05, 0.14, 0.12, 0.16, 0.1, 0.12, 0.06, 0.08, 0.05, 0.025, 0.005])
+
+    return pd.DataFrame({
+        'appid': np.arange(10, 10 + n_rows),
+        'name': pd.Series(np.arange(n_rows)).astype(str).radd('Game '),
+        'release_date': release_date,
+        'english': rng.integers(0, 2, n_rows),
+        'developer': primary,
+        'publisher': publisher,
+        'platforms': 'windows;mac;linux',
+        'required_age': 0,
+        'categories': 'Single-player;Steam Achievements',
+        'genres': genre_pool[rng.integers(0, len(genre_pool), n_rows)],
+        'steamspy_tags': 'Indie;Action;Casual',
+        'achievements': rng.integers(0, 100, n_rows),
+        'positive_ratings': positive,
+        'negative_ratings': negative,
+        'average_playtime': (rng.exponential(150, n_rows)).astype(np.int64),
+        'median_playtime': (rng.exponential(100, n_rows)).astype(np.int64),
+        'owners': rng.choice(OWNER_RANGES, n_rows, p=OWNER_WEIGHTS / OWNER_WEIGHTS.sum()),
+        'price': price,
+    })
+
+
+def synthetic_csv(n_rows, data_dir, seed=0):
+    path = os.path.join(data_dir, f'steam_synthetic_{n_rows}.csv')
+    if not os.path.exists(path):
+        synthetic_steam(n_rows, seed).to_csv(path, index=False, date_format='%Y-%m-%d')
+    return path
+
+
+class StageTimer:
+    """Catat waktu dan puncak memori (tracemalloc) per tahap."""
+
+    def __init__(self):
+        self.results = []
+
+    def run(self, name, fn, rows=None):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+        finally:
+            elapsed = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        self.results.append({
+            'stage': name,
+            'rows': rows,
+            'seconds': round(elapsed, 6),
+            'peak_mb': round(peak / 2**20, 2),
+        })
+        return result
+
+
+def benchmark(csv_path, n_rows):
+    timer = StageTimer()
+    df = timer.run('read_csv', lambda: ingest.read_steam_csv(csv_path), n_rows)
+    timer.run('stream_ingest', lambda: StreamingData.from_csv(csv_path), n_rows)
+
+    snapshot = csv_path + '.feather'
+    if ingest.pa is not None:
+        timer.run('build_snapshot', lambda: ingest.build_snapshot(csv_path, snapshot), n_rows)
+        df = timer.run('load_snapshot', lambda: ingest.load_snapshot(snapshot), n_rows)
+
+    timer.run('build_dimensions[serial]', lambda: build_dimensions(df, workers=1), n_rows)
+    timer.run('build_dimensions[parallel]', lambda: build_dimensions(df, workers=None), n_rows)
+    data = timer.run('build_indices', lambda: SteamData.from_frame(df), n_rows)
+    for time_period in PERIODS:
+        start, end, current, prev = compute.preset_windows(data.cube, time_period)
+        timer.run(f'kpis[{time_period}]', lambda: compute.kpis(data.dimensions, current, prev))
+        mask = timer.run(f'year_mask[{time_period}]', lambda: year_mask(df['release_year'], start, end), n_rows)
+        timer.run(f'bitmap_mask[{time_period}]', lambda: data.bitmaps.mask(start, end), n_rows)
+        timer.run(f'top_games[{time_period}]', lambda: compute.top_games(df, mask), int(mask.sum()))
+        timer.run(f'top_games_sketch[{time_period}]', lambda: data.top_games(start, end))
+        timer.run(f'top_genres[{time_period}]', lambda: compute.top_genres(data.dimensions, current))
+        timer.run(f'top_publishers[{time_period}]', lambda: compute.top_publishers(data.dimensions, current))
+        timer.run(f'games_per_year[{time_period}]', lambda: data.cube.games_per_year(start, end))
+    for price_category in PRICE_CATEGORIES:
+        timer.run(f'bitmap_count[{price_category}]', lambda: data.bitmaps.count(prices=price_category), n_rows)
+        mask = data.bitmaps.mask(prices=price_category)
+        timer.run(f'density[{price_category}]', lambda: compute.density(df, mask), n_rows)
+    timer.run('owner_genres', lambda: compute.owner_genres(data.dimensions, data.bitmaps, None, None), n_rows)
+    mask = data.bitmaps.mask()
+    timer.run('owner_points[Semua]', lambda: compute.owner_points(df, data.dimensions, mask), n_rows)
+
+    sample = timer.run('build_sample', lambda: approx.StratifiedSample.build(data.df), n_rows)
+    timer.run('approx_density[Semua]', lambda: approx.density(data, sample, None, None, 'Semua'), sample.size)
+    timer.run('approx_owner_points[Semua]', lambda: approx.owner_points(data, sample, None, None), sample.size)
+    return timer.results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[30_000, 1_000_000, 10_000_000])
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'steam_benchmark'))
+    parser.add_argument('--json', help='simpan hasil ke file JSON (baseline regresi)')
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {}
+    for n_rows in args.rows:
+        csv_path = synthetic_csv(n_rows, args.data_dir)
+        results = benchmark(csv_path, n_rows)
+        report[str(n_rows)] = results
+
+        print(f"\n== {n_rows:,} baris ==")
+        print(f"{'tahap':<40} {'baris':>12} {'detik':>10} {'puncak MB':>10}")
+        for r in results:
+            rows = f"{r['rows']:,}" if r['rows'] is not None else '-'
+            print(f"{r['stage']:<40} {rows:>12} {r['seconds']:>10.4f} {r['peak_mb']:>10.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import numpy as np
+
+from charts import PRICE_CATEGORIES
+
+ALL = 'Semua'
+
+
+def popcount(bits):
+    """Jumlah bit 1 dalam bitset hasil ``np.packbits``."""
+    if hasattr(np, 'bitwise_count'):  # numpy >= 2.0
+        return int(np.bitwise_count(bits).sum())
+    return int(np.unpackbits(bits).sum())
+
+
+def _concat_bits(left, n_left, right, n_right):
+    """Bitset ``n_left`` baris lalu ``n_right`` baris, tanpa unpack bitset kiri."""
+    if n_left % 8 == 0:
+        return np.concatenate([left, right])
+    head = n_left // 8
+    tail = np.unpackbits(left[head:], count=n_left % 8)
+    return np.concatenate([left[:head], np.packbits(np.concatenate([tail, np.unpackbits(right, count=n_right)]))])
+
+
+class BitmapIndex:
+    """Satu bitset per tahun rilis, kategori harga dan genre.
+
+    Bitset adalah mask bool yang dipak 8 baris per byte (``np.packbits``).
+    Kombinasi filter apa pun = OR antar nilai dalam satu dimensi (mis. dua
+    genre), AND antar dimensi, lalu popcount untuk jumlahnya; tidak ada scan
+    kolom. ``None``/'Semua' berarti dimensi itu tidak difilter. ``all``
+    menandai baris yang masih hidup (belum digantikan delta) dan selalu ikut
+    di-AND.
+    """
+
+    def __init__(self, n_rows, years, prices, genres, alive=None):
+        self.n_rows = n_rows
+        self.years = years
+        self.prices = prices
+        self.genres = genres
+        self.all = np.packbits(np.ones(n_rows, dtype=bool)) if alive is None else alive
+
+    @classmethod
+    def build(cls, df, dimensions):
+        year = df['release_year'].to_numpy()
+        years = {
+            int(y): np.packbits(year == y)
+            for y in np.unique(year[~np.isnan(year)])
+        }
+
+        price = df['price'].to_numpy()
+        prices = {
+            name: np.packbits(predicate(price))
+            for name, predicate in PRICE_CATEGORIES.items() if name != ALL
+        }
+
+        # Baris per genre langsung dari CSR: urutkan entri menurut kode sekali
+        index = dimensions['genres']
+        rows, codes = index.entries()
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(index.labels) + 1))
+        genres = {}
+        for code, label in enumerate(index.labels):
+            mask = np.zeros(len(df), dtype=bool)
+            mask[rows[order[bounds[code]:bounds[code + 1]]]] = True
+            genres[label] = np.packbits(mask)
+        return cls(len(df), years, prices, genres)
+
+    def append(self, df, dimensions, dead_rows):
+        """Index baru: baris ``df`` disambung, ``dead_rows`` dimatikan.
+
+        Hanya byte terakhir bitset lama yang disentuh, jadi biayanya
+        sebanding jumlah baris delta (ditambah salin bitset lama).
+        """
+        delta = BitmapIndex.build(df, dimensions)
+
+        def extend(old, new):
+            old = np.zeros_like(self.all) if old is None else old
+            new = np.zeros_like(delta.all) if new is None else new
+            return _concat_bits(old, self.n_rows, new, delta.n_rows)
+
+        def merge(old, new):
+            return {key: extend(old.get(key), new.get(key)) for key in {**old, **new}}
+
+        alive = extend(self.all, delta.all)
+        dead_rows = np.asarray(dead_rows, dtype=np.int64)
+        np.bitwise_and.at(alive, dead_rows >> 3, ~(np.uint8(0x80) >> (dead_rows & 7).astype(np.uint8)))
+        return BitmapIndex(
+            self.n_rows + delta.n_rows,
+            merge(self.years, delta.years),
+            merge(self.prices, delta.prices),
+            merge(self.genres, delta.genres),
+            alive=alive,
+        )
+
+    GROUPS = ('years', 'prices', 'genres')
+
+    def arrays(self):
+        """Array untuk disimpan (lihat precompute.py): satu matriks per dimensi."""
+        arrays = {'n_rows': np.array(self.n_rows), 'all': self.all}
+        for name in self.GROUPS:
+            group = getattr(self, name)
+            arrays[f'{name}_keys'] = np.array([str(key) for key in group], dtype=str)
+            arrays[f'{name}_bits'] = (
+                np.stack(list(group.values())) if group else np.zeros((0, len(self.all)), np.uint8)
+            )
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        groups = {}
+        for name in cls.GROUPS:
+            keys = arrays[f'{name}_keys'].tolist()
+            if name == 'years':
+                keys = [int(key) for key in keys]
+            groups[name] = dict(zip(keys, arrays[f'{name}_bits']))
+        return cls(int(arrays['n_rows']), alive=arrays['all'], **groups)
+
+    def bitsets(self):
+        yield self.all
+        for group in (self.years, self.prices, self.genres):
+            yield from group.values()
+
+    def freeze(self):
+        """Kunci semua bitset; index ini dibagi antar session."""
+        for bits in self.bitsets():
+            bits.flags.writeable = False
+        return self
+
+    def _any_of(self, group, keys):
+        bits = np.zeros_like(self.all)
+        for key in keys:
+            if key in group:
+                bits |= group[key]
+        return bits
+
+    def select(self, start=None, end=None, prices=None, genres=None):
+        """Bitset baris yang lolos semua filter.
+
+        Tanpa batas tahun ikut baris yang tahun rilisnya tidak diketahui,
+        sama seperti ``year_mask``.
+        """
+        bits = self.all.copy()
+        if start is not None or end is not None:
+            bits &= self._any_of(self.years, [
+                y for y in self.years
+                if (start is None or y >= start) and (end is None or y <= end)
+            ])
+        for group, keys in ((self.prices, prices), (self.genres, genres)):
+            if isinstance(keys, str):
+                keys = [keys]
+            if keys and ALL not in keys:
+                bits &= self._any_of(group, keys)
+        return bits
+
+    def count(self, *args, **kwargs):
+        return popcount(self.select(*args, **kwargs))
+
+    def mask(self, *args, **kwargs):
+        """Mask bool per baris (n_rows byte) untuk dipakai ke kolom."""
+        return np.unpackbits(self.select(*args, **kwargs), count=self.n_rows).view(bool)
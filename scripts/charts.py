@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Kategori harga untuk heatmap densitas; (p > batas bawah) & (p <= batas atas)
+PRICE_CATEGORIES = {
+    'Semua': lambda p: np.ones(len(p), dtype=bool),
+    'Gratis': lambda p: p == 0,
+    'Murah (0-£10)': lambda p: (p > 0) & (p <= 10),
+    'Sedang (£10-£30)': lambda p: (p > 10) & (p <= 30),
+    'Mahal (£30-£100)': lambda p: (p > 30) & (p <= 100),
+    'Premium (£100+)': lambda p: p > 100,
+}
+
+
+def positive_ratio(df, rows=None):
+    """positive / (positive + negative), untuk semua baris atau ``rows`` (mask/posisi)."""
+    positive = df['positive_ratings'].to_numpy()
+    negative = df['negative_ratings'].to_numpy()
+    if rows is not None:
+        positive, negative = positive[rows], negative[rows]
+    positive = positive.astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return positive / (positive + negative)
+
+
+def density_bins(x, y, nbinsx=40, nbinsy=40, weights=None):
+    """Histogram 2D (pusat bin x, pusat bin y, z[y, x]) tanpa NaN.
+
+    Hasilnya cukup dikirim sebagai trace heatmap, jadi ukuran payload
+    O(jumlah bin) dan bukan O(jumlah baris). Dengan ``weights`` (bobot
+    sampel) z adalah jumlah bobot yang dibulatkan.
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    if len(x) == 0:
+        return np.zeros(0), np.zeros(0), np.zeros((0, 0), dtype=np.int64)
+    if weights is not None:
+        weights = weights[valid]
+    z, x_edges, y_edges = np.histogram2d(x, y, bins=(nbinsx, nbinsy), weights=weights)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    return x_centers, y_centers, np.rint(z.T).astype(np.int64)
+
+
+# Level-of-detail Scatterpolar owners vs playtime
+POLAR_WEBGL_THRESHOLD = 2_000
+POLAR_POINT_BUDGET = 10_000
+POLAR_TOP_N = 200
+
+
+def owner_bands(codes, owners, playtime, labels, counts=None, bands_per_decade=4):
+    """Satu marker per sektor genre x pita log10(owners).
+
+    Dipakai bila jumlah titik melebihi POLAR_POINT_BUDGET; ukuran marker
+    mengikuti jumlah game di bin, bukan playtime. Input berupa array per
+    titik (kode genre, owners, playtime), jadi tidak ada DataFrame per titik.
+    Dengan ``counts`` tiap elemen mewakili ``counts[i]`` titik ber-owners
+    sama dan ``playtime[i]`` adalah jumlah playtime-nya (agregat streaming).
+    """
+    counts = np.ones(len(owners), dtype=np.int64) if counts is None else counts
+    band = np.floor(np.log10(np.maximum(owners, 1)) * bands_per_decade).astype(np.int64)
+    n_bands = int(band.max()) + 1 if len(band) else 1
+    keys, group = np.unique(codes.astype(np.int64) * n_bands + band, return_inverse=True)
+    games = np.bincount(group, weights=counts, minlength=len(keys)).astype(np.int64)
+
+    # Median per grup: urutkan owners di dalam grup, ambil satu/dua titik
+    # tengah; posisi titik ke-p dicari lewat kumulatif counts
+    order = np.lexsort((owners, group))
+    sorted_owners = owners[order]
+    cumulative = np.cumsum(counts[order])
+    starts = np.concatenate([[0], np.cumsum(games)[:-1]])
+    lower = sorted_owners[np.searchsorted(cumulative, starts + (games - 1) // 2, side='right')]
+    upper = sorted_owners[np.searchsorted(cumulative, starts + games // 2, side='right')]
+
+    bins = pd.DataFrame({
+        'genres': labels[keys // n_bands],
+        'band': (keys % n_bands).astype(np.float64),
+        'owners': (lower + upper) / 2,
+        'average_playtime': np.bincount(group, weights=playtime, minlength=len(keys)) / games,
+        'games': games,
+    })
+    scale = np.log1p(bins['games']) / np.log1p(max(bins['games'].max(), 1))
+    bins['marker_size'] = 5 + 15 * scale
+    return bins
+
+
+class FigureCache:
+    """LRU cache JSON figure Plotly yang dibatasi total ukuran (byte).
+
+    Satu instance dipakai bersama semua session dalam satu proses server,
+    jadi akses dijaga lock. JSON (string immutable) yang disimpan, bukan
+    objek Figure, supaya tidak ada session yang bisa mengubah isi cache.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            fig_json = self._items.get(key)
+            if fig_json is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return fig_json
+            self.misses += 1
+
+        # Build di luar lock; dua session yang miss bersamaan sama-sama
+        # membangun, yang terakhir menimpa entri dengan hasil identik
+        fig_json = build().to_json()
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+            self._items[key] = fig_json
+            self.size_bytes += len(fig_json)
+            while self.size_bytes > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.size_bytes -= len(evicted)
+                self.evictions += 1
+        return fig_json
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._items),
+                'size_bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,398 @@
+"""Perhitungan dashboard tanpa Streamlit.
+
+Semua fungsi di sini murni: input berupa DataFrame/indeks/cube hasil
+ingest, output berupa angka atau DataFrame kecil yang siap diplot. app.py
+hanya menampilkan hasilnya, dan benchmark.py bisa mengukurnya tanpa
+session Streamlit.
+"""
+import hashlib
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from bitmap import BitmapIndex
+from charts import POLAR_POINT_BUDGET, POLAR_TOP_N, density_bins, owner_bands, positive_ratio
+from cube import YearCube, YearTopK
+from dimensions import build_dimensions
+from ingest import concat_frames, freeze_frame
+from profiling import stage
+
+# Periode -> (rentang tahun saat ini, rentang pembanding); None = terbuka
+PERIODS = {
+    'Semua': ((None, None), None),
+    '5 Tahun Terakhir': ((2014, None), (2009, 2013)),
+    '2010s (2010 - 2019)': ((2010, 2019), (2000, 2009)),
+    '2000s (2000 - 2009)': ((None, 2009), (None, 1999)),
+}
+
+
+class SharedData:
+    """Basis data bersama antar session.
+
+    ``fingerprint`` dihitung saat objek dibuat; ``is_unchanged()`` (panel
+    debug) menghitung ulang dan membandingkannya, jadi perubahan kapan pun
+    setelah build ikut terdeteksi. ``bucket_versions`` berisi versi per
+    tahun rilis (None = tidak diketahui) yang berubah hanya bila delta
+    menyentuh tahun itu; lihat ``range_version``.
+    """
+
+    def __init__(self, bucket_versions=None):
+        self.bucket_versions = {} if bucket_versions is None else bucket_versions
+
+    def _arrays(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _digest(arrays):
+        h = hashlib.sha1()
+        for arr in arrays:
+            # Array object (label) tidak punya buffer tetap; di-hash sebagai teks
+            arr = arr.astype(str) if arr.dtype == object else np.ascontiguousarray(arr)
+            h.update(arr.tobytes())
+        return h.hexdigest()
+
+    def compute_fingerprint(self):
+        return self._digest(self._arrays())
+
+    def is_unchanged(self):
+        return self.compute_fingerprint() == self.fingerprint
+
+    def range_version(self, start=None, end=None):
+        """Versi agregat periode [start, end]; kunci cache hasil per periode."""
+        unbounded = start is None and end is None
+        touched = sorted(
+            (-1 if year is None else year, version) for year, version in self.bucket_versions.items()
+            if (year is None and unbounded) or (
+                year is not None and (start is None or year >= start) and (end is None or year <= end)
+            )
+        )
+        return hashlib.sha1(repr(touched).encode()).hexdigest()[:16]
+
+
+class SteamData(SharedData):
+    """Dataset dasar plus turunan yang dibangun sekali per versi data.
+
+    Satu objek dibagi oleh semua session di proses server, jadi semuanya
+    read-only: session hanya boleh membuat mask dan agregat kecil sendiri.
+    Method query (``top_games``, ``density``, ``owner_genres``,
+    ``owner_points``) sama dengan milik ``streaming.StreamingData``.
+    ``precomputed`` berisi hasil query yang sudah dibangun precompute.py,
+    ``{(method, start, end, *argumen): (range_version, hasil)}``; hasil
+    dipakai hanya selama versi periodenya belum diubah delta.
+    """
+
+    def __init__(self, df, dimensions, cube, bitmaps, top_k, segments=None, bucket_versions=None, precomputed=None):
+        super().__init__(bucket_versions)
+        self.precomputed = {} if precomputed is None else precomputed
+        self.df = df
+        self.dimensions = dimensions
+        self.cube = cube
+        self.bitmaps = bitmaps
+        self.top_k = top_k
+        # (jumlah baris, hash) per segmen df: dasar lalu tiap delta. Segmen
+        # lama tidak pernah berubah, jadi apply_delta cukup meng-hash baris
+        # delta untuk fingerprint objek baru
+        self.segments = segments if segments is not None else ((len(df), frame_digest(df)),)
+        self.fingerprint = self._digest(self._arrays([digest for _, digest in self.segments]))
+
+    @classmethod
+    def from_frame(cls, df):
+        dimensions = build_dimensions(df)
+        with stage('build_year_cube', rows=len(df)):
+            cube = YearCube.build(df, dimensions)
+        with stage('build_bitmaps', rows=len(df)):
+            bitmaps = BitmapIndex.build(df, dimensions)
+        with stage('build_top_k', rows=len(df)):
+            top_k = YearTopK.build(df['release_year'].to_numpy(), df['positive_ratings'].to_numpy())
+        with stage('freeze_shared', rows=len(df)):
+            for index in dimensions.values():
+                index.freeze()
+            return cls(freeze_frame(df), dimensions, cube.freeze(), bitmaps.freeze(), top_k.freeze())
+
+    def apply_delta(self, delta, delta_id):
+        """SteamData baru dengan ``delta`` (frame ingest, kunci appid) diterapkan.
+
+        Baris lama ber-appid sama dimatikan (bit ``alive``), baris delta
+        disambung di belakang. Tokenisasi, cube dan bitmap hanya dihitung
+        untuk baris delta dan baris yang digantikannya; sisanya salin array.
+        Objek lama tidak berubah, session yang masih memakainya aman.
+        """
+        with stage('apply_delta', rows=len(delta)):
+            delta = delta.drop_duplicates('appid', keep='last').reset_index(drop=True)
+            alive = self.bitmaps.mask()
+            dead = np.isin(self.df['appid'].to_numpy(), delta['appid'].to_numpy()) & alive
+            removed = self.df[dead].reset_index(drop=True)
+
+            added_dims = build_dimensions(delta)
+            removed_dims = {name: index.take(dead) for name, index in self.dimensions.items()}
+            dimensions = {name: index.append(added_dims[name]) for name, index in self.dimensions.items()}
+            labels = {name: index.labels for name, index in dimensions.items()}
+            added_dims = {name: index.with_labels(labels[name]) for name, index in added_dims.items()}
+            removed_dims = {name: index.with_labels(labels[name]) for name, index in removed_dims.items()}
+
+            remaps = {name: np.searchsorted(labels[name], index.labels) for name, index in self.dimensions.items()}
+            widths = {name: len(labels[name]) for name in labels}
+            cube = YearCube.combine([
+                (self.cube.relabel(remaps, widths), 1),
+                (YearCube.build(removed, removed_dims), -1),
+                (YearCube.build(delta, added_dims), 1),
+            ])
+            bitmaps = self.bitmaps.append(delta, added_dims, np.flatnonzero(dead))
+
+            # Versi dan Top-K hanya berubah untuk tahun yang disentuh delta
+            bucket_versions = dict(self.bucket_versions)
+            years = np.concatenate([removed['release_year'].to_numpy(), delta['release_year'].to_numpy()])
+            touched = {None if np.isnan(y) else int(y) for y in years}
+            for year in touched:
+                previous = bucket_versions.get(year, '')
+                bucket_versions[year] = hashlib.sha1(f'{previous}:{delta_id}'.encode()).hexdigest()[:16]
+
+            df = concat_frames(self.df, delta[self.df.columns])
+            top_k = self.top_k.replace_years(
+                df['release_year'].to_numpy(), df['positive_ratings'].to_numpy(), bitmaps.mask(), touched,
+            )
+            for index in dimensions.values():
+                index.freeze()
+            segments = self.segments + ((len(delta), frame_digest(df.iloc[len(self.df):])),)
+            return SteamData(
+                freeze_frame(df), dimensions, cube.freeze(), bitmaps.freeze(), top_k.freeze(), segments,
+                bucket_versions=bucket_versions, precomputed=self.precomputed,
+            )
+
+    def _arrays(self, frame_digests=None):
+        if frame_digests is None:
+            bounds = np.cumsum([0] + [rows for rows, _ in self.segments])
+            frame_digests = [frame_digest(self.df.iloc[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+        yield np.array(list(self.df.columns), dtype=str)
+        yield np.array(frame_digests, dtype=str)
+        for index in self.dimensions.values():
+            yield from (index.labels, index.codes, index.offsets)
+        for group in (self.cube.per_year, self.cube.unknown):
+            for name in self.cube.FIELDS:
+                yield np.asarray(group[name])
+        yield from self.bitmaps.bitsets()
+        yield from (self.top_k.years, self.top_k.rows, self.top_k.scores)
+
+    def _lookup(self, key, build):
+        entry = self.precomputed.get(key)
+        if entry is not None and entry[0] == self.range_version(key[1], key[2]):
+            return entry[1]
+        return build()
+
+    def top_games(self, start, end, n=5):
+        if n > self.top_k.k:
+            return top_games(self.df, self.bitmaps.mask(start, end), n)
+        # Gabungan kandidat Top-K per tahun, bukan scan baris periode
+        return self._lookup(
+            ('top_games', start, end, n),
+            lambda: self.df[['name', 'positive_ratings', 'negative_ratings']].take(self.top_k.top(start, end, n)),
+        )
+
+    def density(self, start, end, price_category, nbins=40):
+        return self._lookup(
+            ('density', start, end, price_category, nbins),
+            lambda: density(self.df, self.bitmaps.mask(start, end, prices=price_category), nbins),
+        )
+
+    def owner_genres(self, start, end):
+        return self._lookup(
+            ('owner_genres', start, end),
+            lambda: owner_genres(self.dimensions, self.bitmaps, start, end),
+        )
+
+    def owner_points(self, start, end, genre='Semua'):
+        return self._lookup(
+            ('owner_points', start, end, genre),
+            lambda: owner_points(self.df, self.dimensions, self.bitmaps.mask(start, end), genre),
+        )
+
+
+def frame_digest(df):
+    """Hash isi baris ``df`` (nilai, bukan kode kategori)."""
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def preset_windows(cube, time_period):
+    """(start, end, agregat periode ini, agregat pembanding atau None)."""
+    (start, end), prev_range = PERIODS[time_period]
+    # 'Semua' juga mencakup game yang tanggal rilisnya tidak valid
+    current = cube.window(start, end, include_unknown=time_period == 'Semua')
+    prev = cube.window(*prev_range) if prev_range is not None else None
+    return start, end, current, prev
+
+
+def previous_range(start, end):
+    """Jendela sama panjang tepat sebelum [start, end]."""
+    length = end - start + 1
+    return start - length, start - 1
+
+
+def kpis(dimensions, current, prev=None):
+    genre_counts = current.genre_counts
+    publisher_games = current.publisher_games
+
+    if genre_counts.sum() == 0:
+        most_common_genre = "Unknown"
+    else:
+        most_common_genre = dimensions['genres'].labels[genre_counts.argmax()]
+
+    if publisher_games.sum() == 0:
+        most_common_publisher = "Unknown"
+    else:
+        most_common_publisher = dimensions['publisher'].top(
+            current.publisher_mean_rating, 1, valid=publisher_games > 0
+        )['label'][0]
+
+    result = {
+        'total_games': current.count,
+        'most_common_genre': most_common_genre,
+        'most_common_publisher': most_common_publisher,
+        'avg_price': current.mean_price,
+        'delta_games': None,
+        'delta_price_abs': None,
+        'delta_price_pct': None,
+    }
+    if prev is not None and prev.count > 0:
+        result['delta_games'] = current.count - prev.count
+        result['delta_price_abs'] = current.mean_price - prev.mean_price
+        result['delta_price_pct'] = result['delta_price_abs'] / prev.mean_price * 100
+    return result
+
+
+def nlargest_positions(values, n):
+    """Posisi ``n`` nilai terbesar, urut menurun; seri -> posisi lebih awal.
+
+    Sama dengan ``Series.nlargest(n, keep='first')`` tapi cukup O(len) untuk
+    mencari ambang, jadi tidak perlu mengurutkan atau menyalin semua baris.
+    """
+    if len(values) <= n:
+        return np.argsort(-values, kind='stable')
+    threshold = np.partition(values, len(values) - n)[len(values) - n]
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[:n - len(above)]
+    candidates = np.sort(np.concatenate([above, ties]))
+    return candidates[np.argsort(-values[candidates], kind='stable')]
+
+
+def top_games(df, mask, n=5):
+    with stage('top_games', rows=int(mask.sum())):
+        # Baris di luar mask diberi skor -1 (rating selalu >= 0)
+        scores = np.where(mask, df['positive_ratings'].to_numpy(), -1)
+        top = nlargest_positions(scores, n)
+        top = top[mask[top]]
+        # Hanya n baris hasil akhir yang dibentuk jadi DataFrame
+        return df[['name', 'positive_ratings', 'negative_ratings']].take(top)
+
+
+def top_genres(dimensions, current, n=5):
+    counts = current.genre_counts
+    top = dimensions['genres'].top(counts, n, valid=counts > 0)
+    top.columns = ['genre', 'count']
+    return top
+
+
+def top_publishers(dimensions, current, n=5):
+    top = dimensions['publisher'].top(
+        current.publisher_mean_rating, n, valid=current.publisher_games > 0
+    )
+    top.columns = ['publisher', 'positive_ratings']
+    return top
+
+
+def price_distribution(current):
+    dist = pd.DataFrame({
+        'price_category': ['Berbayar', 'Gratis'],
+        'count': [current.count - current.free_count, current.free_count],
+    })
+    return (
+        dist[dist['count'] > 0]
+        .sort_values('count', ascending=False, kind='stable')
+        .reset_index(drop=True)
+    )
+
+
+def density(df, mask, nbins=40):
+    """Heatmap rasio rating positif vs harga untuk baris ``mask``.
+
+    Mask berasal dari BitmapIndex (periode x kategori harga); yang disalin
+    hanya nilai baris terpilih untuk histogram.
+    """
+    with stage('density_bins', rows=len(df)):
+        price = df['price'].to_numpy()[mask].astype(np.float64)
+        return density_bins(positive_ratio(df, mask), price, nbinsx=nbins, nbinsy=nbins)
+
+
+def owner_genres(dimensions, bitmaps, start, end):
+    """Genre yang punya minimal satu game di periode (AND bitset per genre)."""
+    period = bitmaps.select(start, end)
+    return [
+        label for label in dimensions['genres'].labels
+        if (period & bitmaps.genres[label]).any()
+    ]
+
+
+def owner_points(df, dimensions, period_mask, genre='Semua', row_weights=None):
+    """Titik Scatterpolar owners vs playtime (sudah level-of-detail).
+
+    Hasil: (df_owner, df_owner_bins atau None, genre_map, jumlah titik asli).
+    ``row_weights(rows)`` memberi bobot tiap baris bila ``period_mask``
+    berupa sampel (lihat approx.py); jumlah game per pita ikut bobot itu.
+    """
+    with stage('owner_points') as rec:
+        result = _owner_points(df, dimensions, period_mask, genre, row_weights)
+        rec['rows'] = result[3]
+    return result
+
+
+def _owner_points(df, dimensions, mask, genre, row_weights=None):
+    genre_index = dimensions['genres']
+
+    # Satu titik per (game, genre) langsung dari index genre; semua kolom
+    # per titik berupa array hasil gather, bukan DataFrame hasil explode
+    owner_rows, owner_codes = genre_index.entries(mask)
+    if genre != 'Semua':
+        keep = owner_codes == genre_index.code_of(genre)
+        owner_rows, owner_codes = owner_rows[keep], owner_codes[keep]
+
+    # owners_mid (titik tengah rentang owners) sudah diparse saat ingest;
+    # yang kosong diisi rata-rata periode ini
+    owners_mid = df['owners_mid'].to_numpy()
+    owners = owners_mid[owner_rows].astype(np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # periode tanpa owners valid -> NaN
+        owners[np.isnan(owners)] = np.nanmean(owners_mid[mask], dtype=np.float64)
+    playtime = df['average_playtime'].to_numpy()[owner_rows].astype(np.float64)
+    valid = ~(np.isnan(owners) | np.isnan(playtime))
+    owner_rows, owner_codes, owners, playtime = owner_rows[valid], owner_codes[valid], owners[valid], playtime[valid]
+
+    present = np.unique(owner_codes)
+    genre_map = {g: i * 360 / len(present) for i, g in enumerate(genre_index.labels[present])}
+    theta = np.zeros(len(genre_index.labels))
+    theta[present] = list(genre_map.values())
+
+    # Level of detail: di atas budget titik diringkas per sektor genre x pita
+    # owner dan hanya Top N game (owner terbanyak) yang tetap tampil sebagai
+    # titik dengan detail hover
+    n_points = len(owner_rows)
+    if n_points > POLAR_POINT_BUDGET:
+        if row_weights is None:
+            df_owner_bins = owner_bands(owner_codes, owners, playtime, genre_index.labels)
+        else:
+            counts = np.maximum(np.rint(row_weights(owner_rows)), 1).astype(np.int64)
+            df_owner_bins = owner_bands(owner_codes, owners, playtime * counts, genre_index.labels, counts=counts)
+        df_owner_bins['theta'] = df_owner_bins['genres'].map(genre_map)
+        keep = nlargest_positions(owners, POLAR_TOP_N)
+        owner_rows, owner_codes, owners, playtime = owner_rows[keep], owner_codes[keep], owners[keep], playtime[keep]
+    else:
+        df_owner_bins = None
+
+    # Hanya titik yang benar-benar digambar yang dibentuk jadi DataFrame
+    df_owner = df[['name', 'publisher']].take(owner_rows)
+    df_owner['owners'] = owners
+    df_owner['average_playtime'] = playtime
+    df_owner['genres'] = genre_index.labels[owner_codes]
+    df_owner['theta'] = theta[owner_codes]
+    df_owner['owners_scaled'] = owners
+    df_owner['marker_size'] = np.clip(playtime / 60, 5, 20)
+    return df_owner, df_owner_bins, genre_map, n_points
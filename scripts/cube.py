@@ -0,0 +1,302 @@
+import numpy as np
+import pandas as pd
+
+
+def year_mask(release_year, start=None, end=None):
+    """Mask baris untuk rentang tahun; tanpa batas = semua baris (termasuk NaN)."""
+    mask = np.ones(len(release_year), dtype=bool)
+    if start is not None:
+        mask &= (release_year >= start).to_numpy()
+    if end is not None:
+        mask &= (release_year <= end).to_numpy()
+    return mask
+
+
+class YearWindow:
+    """Agregat satu rentang tahun, hasil selisih dua baris prefix sum."""
+
+    def __init__(self, count, price_sum, price_n, free_count,
+                 genre_counts, publisher_games, publisher_rating_sum):
+        self.count = int(count)
+        self.price_sum = float(price_sum)
+        self.price_n = int(price_n)
+        self.free_count = int(free_count)
+        self.genre_counts = genre_counts
+        self.publisher_games = publisher_games
+        self.publisher_rating_sum = publisher_rating_sum
+
+    @property
+    def mean_price(self):
+        return self.price_sum / self.price_n if self.price_n else float('nan')
+
+    @property
+    def publisher_mean_rating(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.publisher_rating_sum / self.publisher_games
+
+
+class YearCube:
+    """Agregat per release_year dengan prefix sum di sumbu tahun.
+
+    Tahun disimpan rapat dari ``first_year`` s.d. ``last_year``; baris tanpa
+    tahun rilis (tanggal gagal di-parse) ada di bucket terpisah yang hanya
+    ikut dihitung bila ``include_unknown=True`` (periode 'Semua').
+    """
+
+    FIELDS = ('count', 'price_sum', 'price_n', 'free_count',
+              'genre_counts', 'publisher_games', 'publisher_rating_sum')
+
+    # Field yang sumbu keduanya label dimensi (kode DimensionIndex)
+    LABEL_FIELDS = {
+        'genre_counts': 'genres',
+        'publisher_games': 'publisher',
+        'publisher_rating_sum': 'publisher',
+    }
+
+    def __init__(self, first_year, per_year, unknown):
+        self.first_year = first_year
+        self.per_year = per_year
+        self.unknown = unknown
+        # cum[k] = jumlah tahun ke-0 .. k-1, jadi rentang [a, b] = cum[b+1] - cum[a]
+        self.cum = {
+            name: np.concatenate([np.zeros((1,) + arr.shape[1:], arr.dtype), np.cumsum(arr, axis=0)])
+            for name, arr in per_year.items()
+        }
+
+    def freeze(self):
+        """Kunci semua array; cube ini dibagi antar session."""
+        for group in (self.per_year, self.unknown, self.cum):
+            for arr in group.values():
+                if isinstance(arr, np.ndarray):
+                    arr.flags.writeable = False
+        return self
+
+    def arrays(self):
+        """Array untuk disimpan (lihat precompute.py); ``cum`` dihitung ulang saat dimuat."""
+        return {
+            'first_year': np.array(self.first_year),
+            **{f'per_year_{name}': arr for name, arr in self.per_year.items()},
+            **{f'unknown_{name}': np.asarray(arr) for name, arr in self.unknown.items()},
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(
+            int(arrays['first_year']),
+            {name: arrays[f'per_year_{name}'] for name in cls.FIELDS},
+            {name: arrays[f'unknown_{name}'][()] for name in cls.FIELDS},
+        )
+
+    @property
+    def n_years(self):
+        return len(self.per_year['count'])
+
+    @property
+    def last_year(self):
+        return self.first_year + self.n_years - 1
+
+    @classmethod
+    def build(cls, df, dimensions):
+        year = df['release_year'].to_numpy(dtype=np.float64)
+        known = ~np.isnan(year)
+        first_year = int(np.nanmin(year)) if known.any() else 0
+        last_year = int(np.nanmax(year)) if known.any() else -1
+        n_years = last_year - first_year + 1
+        # Bucket terakhir (= n_years) untuk tahun yang tidak diketahui
+        bucket = np.full(len(df), n_years, dtype=np.int64)
+        bucket[known] = year[known].astype(np.int64) - first_year
+        n_buckets = n_years + 1
+
+        price = df['price'].to_numpy(dtype=np.float64)
+        has_price = ~np.isnan(price)
+        positive = df['positive_ratings'].to_numpy(dtype=np.float64)
+
+        def by_bucket(weights=None):
+            return np.bincount(bucket, weights=weights, minlength=n_buckets)
+
+        def by_bucket_and_code(index, weights=None):
+            rows, codes = index.entries()
+            n_labels = len(index.labels)
+            flat = bucket[rows] * n_labels + codes
+            w = None if weights is None else weights[rows]
+            return np.bincount(flat, weights=w, minlength=n_buckets * n_labels).reshape(n_buckets, n_labels)
+
+        full = {
+            'count': by_bucket().astype(np.int64),
+            'price_sum': by_bucket(np.where(has_price, price, 0.0)),
+            'price_n': by_bucket(has_price.astype(np.float64)).astype(np.int64),
+            'free_count': by_bucket((price == 0).astype(np.float64)).astype(np.int64),
+            'genre_counts': by_bucket_and_code(dimensions['genres']).astype(np.int64),
+            'publisher_games': by_bucket_and_code(dimensions['publisher']).astype(np.int64),
+            'publisher_rating_sum': by_bucket_and_code(dimensions['publisher'], positive),
+        }
+        per_year = {name: arr[:n_years] for name, arr in full.items()}
+        unknown = {name: arr[n_years] for name, arr in full.items()}
+        return cls(first_year, per_year, unknown)
+
+    def _bounds(self, start, end):
+        a = 0 if start is None else int(start) - self.first_year
+        b = self.n_years - 1 if end is None else int(end) - self.first_year
+        return max(a, 0), min(b, self.n_years - 1)
+
+    def relabel(self, remaps, widths):
+        """Cube yang sama dengan kolom label dipindah: ``remaps[dim][lama] = baru``."""
+        def widen(name, arr):
+            dim = self.LABEL_FIELDS.get(name)
+            if dim is None:
+                return arr
+            out = np.zeros(arr.shape[:-1] + (widths[dim],), arr.dtype)
+            out[..., remaps[dim]] = arr
+            return out
+
+        return YearCube(
+            self.first_year,
+            {name: widen(name, arr) for name, arr in self.per_year.items()},
+            {name: widen(name, arr) for name, arr in self.unknown.items()},
+        )
+
+    @classmethod
+    def combine(cls, parts):
+        """Jumlah bertanda ``[(cube, 1 atau -1), ...]``; label semua cube harus sama.
+
+        Rentang tahun hasil dipangkas ke tahun yang masih punya game, sama
+        seperti cube yang dibangun ulang dari awal.
+        """
+        known = [cube for cube, _ in parts if cube.n_years > 0]
+        first = min((cube.first_year for cube in known), default=0)
+        last = max((cube.last_year for cube in known), default=-1)
+        per_year, unknown = {}, {}
+        for name in cls.FIELDS:
+            template = parts[0][0].per_year[name]
+            total = np.zeros((last - first + 1,) + template.shape[1:], template.dtype)
+            rest = np.zeros(template.shape[1:], template.dtype)
+            for cube, sign in parts:
+                offset = cube.first_year - first
+                total[offset:offset + cube.n_years] += sign * cube.per_year[name]
+                rest = rest + sign * cube.unknown[name]
+            per_year[name], unknown[name] = total, rest
+
+        present = np.flatnonzero(per_year['count'])
+        if len(present) == 0:
+            return cls(0, {name: arr[:0] for name, arr in per_year.items()}, unknown)
+        a, b = present[0], present[-1] + 1
+        return cls(first + int(a), {name: arr[a:b] for name, arr in per_year.items()}, unknown)
+
+    def buckets(self, start=None, end=None):
+        """Indeks bucket (baris per_year; ``n_years`` = tahun tak diketahui)
+        yang tercakup ``year_mask(start, end)``."""
+        a, b = self._bounds(start, end)
+        buckets = np.arange(a, b + 1)
+        if start is None and end is None:
+            buckets = np.append(buckets, self.n_years)
+        return buckets
+
+    def sums(self, start=None, end=None):
+        a, b = self._bounds(start, end)
+        return {
+            name: self.cum[name][b + 1] - self.cum[name][a] if a <= b else np.zeros_like(self.cum[name][0])
+            for name in self.FIELDS
+        }
+
+    def window(self, start=None, end=None, include_unknown=False):
+        """Agregat tahun ``start`` s.d. ``end`` (inklusif, None = terbuka)."""
+        values = self.sums(start, end)
+        if include_unknown:
+            values = {name: values[name] + self.unknown[name] for name in self.FIELDS}
+        return YearWindow(**values)
+
+    def games_per_year(self, start=None, end=None):
+        a, b = self._bounds(start, end)
+        counts = self.per_year['count'][a:b + 1] if a <= b else np.zeros(0, np.int64)
+        years = np.arange(self.first_year + a, self.first_year + a + len(counts))
+        present = counts > 0
+        return pd.DataFrame({'release_year': years[present], 'count': counts[present]})
+
+
+class YearTopK:
+    """``k`` baris dengan skor tertinggi per tahun rilis.
+
+    Top-n periode apa pun (n <= k) pasti ada di gabungan kandidat tahun-tahun
+    periode itu, jadi cukup mengurutkan paling banyak k x jumlah tahun
+    kandidat, bukan semua baris periode. Urutan sama dengan
+    ``nlargest(keep='first')``: skor menurun, seri -> posisi baris lebih awal.
+    Tahun yang tidak diketahui disimpan sebagai ``UNKNOWN_YEAR``.
+    """
+
+    UNKNOWN_YEAR = -1
+
+    def __init__(self, k, years, rows, scores):
+        self.k = k
+        self.years = years    # (grup,) tahun terurut
+        self.rows = rows      # (grup, k) posisi baris, -1 = kosong
+        self.scores = scores  # (grup, k)
+
+    @classmethod
+    def year_keys(cls, release_year):
+        year = np.asarray(release_year, dtype=np.float64)
+        return np.where(np.isnan(year), cls.UNKNOWN_YEAR, year).astype(np.int64)
+
+    @classmethod
+    def build(cls, release_year, scores, k=10, rows=None):
+        """Sketch dari kolom ``release_year`` dan ``scores``; ``rows`` membatasi baris."""
+        rows = np.arange(len(scores)) if rows is None else np.asarray(rows, dtype=np.int64)
+        keys = cls.year_keys(np.asarray(release_year)[rows])
+        values = np.asarray(scores, dtype=np.int64)[rows]
+        order = np.lexsort((rows, -values, keys))
+        keys, values, rows = keys[order], values[order], rows[order]
+
+        years, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        group = np.repeat(np.arange(len(years)), counts)
+        rank = np.arange(len(keys)) - starts[group]
+        keep = rank < k
+        out_rows = np.full((len(years), k), -1, dtype=np.int64)
+        out_scores = np.zeros((len(years), k), dtype=np.int64)
+        out_rows[group[keep], rank[keep]] = rows[keep]
+        out_scores[group[keep], rank[keep]] = values[keep]
+        return cls(k, years, out_rows, out_scores)
+
+    def replace_years(self, release_year, scores, alive, years):
+        """Sketch baru dengan tahun ``years`` (None = tak diketahui) dihitung
+        ulang dari baris ``alive``; tahun lain disalin apa adanya."""
+        keys = np.array([self.UNKNOWN_YEAR if y is None else y for y in years], dtype=np.int64)
+        rescan = np.flatnonzero(alive & np.isin(self.year_keys(release_year), keys))
+        fresh = YearTopK.build(release_year, scores, self.k, rows=rescan)
+        kept = ~np.isin(self.years, keys)
+        years = np.concatenate([self.years[kept], fresh.years])
+        order = np.argsort(years, kind='stable')
+        return YearTopK(
+            self.k, years[order],
+            np.concatenate([self.rows[kept], fresh.rows])[order],
+            np.concatenate([self.scores[kept], fresh.scores])[order],
+        )
+
+    def arrays(self):
+        """Array untuk disimpan (lihat precompute.py)."""
+        return {'k': np.array(self.k), 'years': self.years, 'rows': self.rows, 'scores': self.scores}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(int(arrays['k']), arrays['years'], arrays['rows'], arrays['scores'])
+
+    def freeze(self):
+        """Kunci semua array; sketch ini dibagi antar session."""
+        for arr in (self.years, self.rows, self.scores):
+            arr.flags.writeable = False
+        return self
+
+    def top(self, start=None, end=None, n=5):
+        """Posisi baris Top ``n`` untuk rentang tahun (seperti ``year_mask``)."""
+        if n > self.k:
+            raise ValueError(f"sketch hanya menyimpan Top {self.k} per tahun")
+        known = self.years != self.UNKNOWN_YEAR
+        keep = known.copy()
+        if start is not None:
+            keep &= self.years >= start
+        if end is not None:
+            keep &= self.years <= end
+        if start is None and end is None:
+            keep |= ~known
+        rows, scores = self.rows[keep].ravel(), self.scores[keep].ravel()
+        present = rows >= 0
+        rows, scores = rows[present], scores[present]
+        return rows[np.lexsort((rows, -scores))[:n]]
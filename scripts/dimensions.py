@@ -0,0 +1,211 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from profiling import stage
+
+# Kolom dengan nilai unik sebanyak ini atau lebih ditokenisasi paralel;
+# di bawahnya biaya menyalakan proses lebih besar dari hasilnya
+PARALLEL_MIN_VALUES = 50_000
+
+
+def category_values(series):
+    """(nilai unik, kode nilai per baris) dari kolom kategori/teks.
+
+    NaN mendapat slot terakhir berisi '' yang ditokenisasi menjadi ``fill``.
+    """
+    cat = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    cat = cat.cat.remove_unused_categories()
+    values = cat.cat.categories.astype(str).to_numpy(dtype=object)
+    row_cat = cat.cat.codes.to_numpy().astype(np.int64)
+    if (row_cat < 0).any():
+        values = np.append(values, '')
+        row_cat[row_cat < 0] = len(values) - 1
+    return values, row_cat
+
+
+def tokenize_values(values, sep=';', exclude=(), fill='Unknown'):
+    """Nilai 'Action;RPG' -> (label terurut, jumlah token per nilai, kode token).
+
+    Fungsi tingkat modul supaya bisa dijalankan di proses worker untuk satu
+    potongan nilai unik; hasil potongan digabung ``merge_tokens``.
+    """
+    excluded = {e.lower() for e in exclude}
+    per_value = []
+    for value in values:
+        tokens = [t.strip() for t in str(value).split(sep)]
+        tokens = [t for t in tokens if t] or [fill]
+        per_value.append([t for t in tokens if t.lower() not in excluded])
+
+    labels = np.array(sorted({t for tokens in per_value for t in tokens}), dtype=object)
+    lookup = {label: i for i, label in enumerate(labels)}
+    value_len = np.array([len(tokens) for tokens in per_value], dtype=np.int64)
+    value_codes = np.array([lookup[t] for tokens in per_value for t in tokens], dtype=np.int32)
+    return labels, value_len, value_codes
+
+
+def merge_tokens(parts):
+    """Gabungkan hasil ``tokenize_values`` per potongan (urut) ke satu kosakata."""
+    labels = np.unique(np.concatenate([part[0] for part in parts])).astype(object)
+    value_len = np.concatenate([part[1] for part in parts])
+    value_codes = np.concatenate([
+        np.searchsorted(labels, part_labels).astype(np.int32)[part_codes]
+        for part_labels, _, part_codes in parts
+    ])
+    return labels, value_len, value_codes
+
+
+class DimensionIndex:
+    """Kolom multi-nilai (mis. 'Action;RPG') dalam bentuk CSR.
+
+    Kode milik baris ke-i ada di ``codes[offsets[i]:offsets[i + 1]]`` dan
+    ``labels[code]`` adalah nama aslinya. Label diurutkan alfabetis sehingga
+    tie-break argmax sama dengan ``Series.mode()``.
+    """
+
+    def __init__(self, labels, codes, offsets):
+        self.labels = labels
+        self.codes = codes
+        self.offsets = offsets
+        self.row_ids = np.repeat(
+            np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets)
+        )
+
+    @classmethod
+    def from_series(cls, series, sep=';', exclude=(), fill='Unknown'):
+        # Split/strip cukup sekali per nilai unik (kategori), bukan per baris
+        values, row_cat = category_values(series)
+        return cls.from_tokens(*tokenize_values(values, sep, exclude, fill), row_cat)
+
+    @classmethod
+    def from_tokens(cls, labels, value_len, value_codes, row_cat):
+        """Index dari hasil ``tokenize_values`` dan kode nilai tiap baris."""
+        value_start = np.concatenate([[0], np.cumsum(value_len)[:-1]]).astype(np.int64)
+        row_len = value_len[row_cat]
+        offsets = np.zeros(len(row_cat) + 1, dtype=np.int64)
+        np.cumsum(row_len, out=offsets[1:])
+
+        row_ids = np.repeat(np.arange(len(row_cat)), row_len)
+        within = np.arange(offsets[-1]) - offsets[row_ids]
+        codes = value_codes[value_start[row_cat][row_ids] + within]
+        return cls(labels, codes, offsets)
+
+    def freeze(self):
+        """Kunci semua array; index ini dibagi antar session."""
+        for arr in (self.labels, self.codes, self.offsets, self.row_ids):
+            arr.flags.writeable = False
+        return self
+
+    def arrays(self):
+        """Array untuk disimpan (lihat precompute.py); label jadi teks."""
+        return {'labels': self.labels.astype(str), 'codes': self.codes, 'offsets': self.offsets}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays['labels'].astype(object), arrays['codes'], arrays['offsets'])
+
+    def take(self, row_mask):
+        """Index untuk baris ``row_mask`` saja (label sama, baris dinomori ulang)."""
+        lengths = np.diff(self.offsets)[row_mask]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return DimensionIndex(self.labels, self.codes[row_mask[self.row_ids]], offsets)
+
+    def with_labels(self, labels):
+        """Index yang sama dengan kode untuk ``labels`` (superset terurut)."""
+        remap = np.searchsorted(labels, self.labels).astype(np.int32)
+        return DimensionIndex(labels, remap[self.codes], self.offsets)
+
+    def append(self, other):
+        """Baris ``other`` disambung di belakang; label jadi gabungan keduanya."""
+        labels = np.union1d(self.labels, other.labels).astype(object)
+        left, right = self.with_labels(labels), other.with_labels(labels)
+        return DimensionIndex(
+            labels,
+            np.concatenate([left.codes, right.codes]),
+            np.concatenate([left.offsets, right.offsets[1:] + left.offsets[-1]]),
+        )
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def code_of(self, label):
+        i = np.searchsorted(self.labels, label)
+        return int(i) if i < len(self.labels) and self.labels[i] == label else -1
+
+    def entries(self, row_mask=None):
+        """(row_ids, codes) untuk baris yang lolos ``row_mask``."""
+        if row_mask is None:
+            return self.row_ids, self.codes
+        keep = row_mask[self.row_ids]
+        return self.row_ids[keep], self.codes[keep]
+
+    def counts(self, row_mask=None):
+        _, codes = self.entries(row_mask)
+        return np.bincount(codes, minlength=len(self.labels))
+
+    def sums(self, values, row_mask=None):
+        rows, codes = self.entries(row_mask)
+        return np.bincount(codes, weights=values[rows], minlength=len(self.labels))
+
+    def top(self, scores, n, valid=None):
+        """Label dan skor ``n`` teratas, urut menurun (stabil).
+
+        Hanya kandidat yang tidak di bawah skor ke-n yang diurutkan, bukan
+        semua label (mis. ratusan ribu publisher).
+        """
+        scores = np.asarray(scores, dtype=float)
+        order = np.arange(len(scores)) if valid is None else np.flatnonzero(valid)
+        if 0 < n < len(order):
+            threshold = np.partition(-scores[order], n - 1)[n - 1]
+            if not np.isnan(threshold):  # kurang dari n skor non-NaN
+                order = order[-scores[order] <= threshold]
+        order = order[np.argsort(-scores[order], kind='stable')][:n]
+        return pd.DataFrame({'label': self.labels[order], 'value': scores[order]})
+
+
+# Kolom multi-nilai -> argumen from_series
+DIMENSIONS = {
+    'genres': {'exclude': ('indie',)},
+    'publisher': {},
+}
+
+
+def build_dimensions(df, columns=DIMENSIONS, workers=1):
+    """Index per kolom multi-nilai (``columns``: nama -> argumen from_series).
+
+    Default serial: proses app (server Streamlit, watcher) tidak membuka
+    pool proses. Skrip offline (benchmark.py) boleh memberi ``workers`` > 1
+    atau None (= jumlah core); nilai unik kolom yang besar (mis. publisher
+    di ekspor jutaan baris) lalu dibagi ke proses worker, semua potongan
+    semua kolom dikirim sekaligus, kosakata tiap kolom digabung dan CSR per
+    baris dibangun di numpy.
+    """
+    workers = workers or os.cpu_count() or 1
+    values = {name: category_values(df[name]) for name in columns}
+    parallel = [
+        name for name in columns
+        if workers > 1 and len(values[name][0]) >= PARALLEL_MIN_VALUES
+    ]
+    dimensions = {}
+    with ProcessPoolExecutor(workers) if parallel else nullcontext() as pool:
+        futures = {
+            name: [
+                pool.submit(tokenize_values, shard, **columns[name])
+                # Beberapa potongan per worker supaya beban tetap rata
+                for shard in np.array_split(values[name][0], workers * 4)
+            ]
+            for name in parallel
+        }
+        for name, options in columns.items():
+            with stage(f'build_dimension[{name}]', rows=len(df)):
+                if name in futures:
+                    tokens = merge_tokens([future.result() for future in futures[name]])
+                else:
+                    tokens = tokenize_values(values[name][0], **options)
+                dimensions[name] = DimensionIndex.from_tokens(*tokens, values[name][1])
+    return dimensions
+
@@ -0,0 +1,282 @@
+"""Backend query SQL: DuckDB langsung di atas snapshot Parquet.
+
+Pengganti ``compute.SteamData`` dengan atribut dan method query yang sama
+(``dimensions``, ``cube``, ``top_games``, ``density``, ``owner_genres``,
+``owner_points``), tapi tanpa DataFrame penuh di memori: tiap query
+dijalankan DuckDB (multi-thread, semua core) di atas file Parquet, hanya
+membaca kolom yang dipakai dan melewati row group yang tidak lolos filter
+tahun/harga. SteamData (pandas/numpy) tetap menjadi backend referensi.
+"""
+import numpy as np
+
+from charts import POLAR_POINT_BUDGET, POLAR_TOP_N, owner_bands
+from compute import SharedData
+from cube import YearCube
+from dimensions import DIMENSIONS, DimensionIndex
+from ingest import parquet_snapshot
+from profiling import stage
+
+try:
+    import duckdb
+except ImportError:  # backend opsional
+    duckdb = None
+
+# Predikat SQL padanan charts.PRICE_CATEGORIES
+PRICE_SQL = {
+    'Semua': 'TRUE',
+    'Gratis': 'price = 0',
+    'Murah (0-£10)': 'price > 0 AND price <= 10',
+    'Sedang (£10-£30)': 'price > 10 AND price <= 30',
+    'Mahal (£30-£100)': 'price > 30 AND price <= 100',
+    'Premium (£100+)': 'price > 100',
+}
+
+YEAR_SQL = 'CAST(release_year AS BIGINT)'
+
+
+def _literal(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def tokens_sql(column, sep=';', exclude=(), fill='Unknown'):
+    """Ekspresi list token per baris, sama dengan ``DimensionIndex.from_series``."""
+    split = f"[trim(t) FOR t IN string_split(coalesce({column}, ''), {_literal(sep)}) IF trim(t) <> '']"
+    tokens = f"CASE WHEN len({split}) = 0 THEN [{_literal(fill)}] ELSE {split} END"
+    if exclude:
+        excluded = ', '.join(_literal(e.lower()) for e in exclude)
+        tokens = f"[t FOR t IN {tokens} IF lower(t) NOT IN ({excluded})]"
+    return tokens
+
+
+def year_filter(start, end):
+    """(klausa WHERE, parameter) padanan ``cube.year_mask``."""
+    clauses, params = [], {}
+    if start is not None:
+        clauses.append('release_year >= $start')
+        params['start'] = start
+    if end is not None:
+        clauses.append('release_year <= $end')
+        params['end'] = end
+    return ' AND '.join(clauses) or 'TRUE', params
+
+
+def _edges(lo, hi, nbins):
+    # Sama dengan np.histogram2d tanpa range: rentang nol dilebarkan 0.5
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, nbins + 1)
+
+
+def _bin_sql(column, name):
+    # Tebakan dari rumus lalu dikoreksi satu bin terhadap tepi sebenarnya,
+    # supaya hasilnya sama dengan searchsorted di np.histogram2d
+    guess = f"least(greatest(floor(({column} - ${name}_lo) * ${name}_scale), 0), $nbins - 1)::BIGINT"
+    return (
+        f"CASE WHEN {guess} > 0 AND {column} < ${name}_edges[{guess} + 1] THEN {guess} - 1 "
+        f"WHEN {guess} < $nbins - 1 AND {column} >= ${name}_edges[{guess} + 2] THEN {guess} + 1 "
+        f"ELSE {guess} END"
+    )
+
+
+class DuckDBData(SharedData):
+    """Dataset di file Parquet, di-query lewat DuckDB.
+
+    ``dimensions`` hanya berisi label (seperti mode streaming) dan ``cube``
+    dibangun sekali dengan GROUP BY di SQL, jadi KPI tetap selisih dua baris
+    prefix sum. Satu koneksi dibagi semua session; tiap query memakai
+    cursor sendiri sehingga aman dipanggil dari banyak thread.
+    """
+
+    def __init__(self, connection, dimensions, cube):
+        super().__init__()
+        self.connection = connection
+        self.dimensions = dimensions
+        self.cube = cube
+        for index in dimensions.values():
+            index.freeze()
+        cube.freeze()
+        self.fingerprint = self.compute_fingerprint()
+
+    @classmethod
+    def from_csv(cls, path):
+        if duckdb is None:
+            raise ImportError("backend 'duckdb' butuh paket duckdb")
+        parquet_path = parquet_snapshot(path)
+        connection = duckdb.connect()
+        # file_row_number = posisi baris seperti di DataFrame, untuk seri Top-N
+        connection.execute(
+            "CREATE VIEW steam AS SELECT file_row_number AS row, * "
+            f"FROM read_parquet({_literal(parquet_path)}, file_row_number = true)"
+        )
+        with stage('duckdb_build_cube'):
+            dimensions, cube = cls._build_cube(connection)
+        return cls(connection, dimensions, cube)
+
+    @staticmethod
+    def _build_cube(connection):
+        totals = connection.execute(f"""
+            SELECT {YEAR_SQL} AS year, count(*) AS count, sum(price::DOUBLE) AS price_sum,
+                   count(price) AS price_n, count(*) FILTER (WHERE price = 0) AS free_count
+            FROM steam GROUP BY ALL
+        """).fetchdf()
+        per_label = {
+            name: connection.execute(f"""
+                SELECT year, token, count(*) AS games, sum(positive_ratings::DOUBLE) AS rating_sum
+                FROM (SELECT {YEAR_SQL} AS year, unnest({tokens_sql(name, **options)}) AS token,
+                             positive_ratings FROM steam)
+                GROUP BY ALL
+            """).fetchdf()
+            for name, options in DIMENSIONS.items()
+        }
+
+        known = totals['year'].notna()
+        first_year = int(totals['year'][known].min()) if known.any() else 0
+        n_years = int(totals['year'][known].max()) - first_year + 1 if known.any() else 0
+
+        def bucket_of(year):
+            # Bucket terakhir (= n_years) untuk tahun yang tidak diketahui
+            return np.where(year.notna(), year.fillna(first_year) - first_year, n_years).astype(np.int64)
+
+        full = {}
+        bucket = bucket_of(totals['year'])
+        for name, dtype in (('count', np.int64), ('price_sum', np.float64),
+                            ('price_n', np.int64), ('free_count', np.int64)):
+            full[name] = np.zeros(n_years + 1, dtype)
+            full[name][bucket] = totals[name].fillna(0).to_numpy()
+
+        dimensions = {}
+        for name, frame in per_label.items():
+            labels = np.unique(frame['token'].to_numpy(dtype=object))
+            dimensions[name] = DimensionIndex(labels, np.zeros(0, np.int32), np.zeros(1, np.int64))
+            rows, codes = bucket_of(frame['year']), np.searchsorted(labels, frame['token'].to_numpy(dtype=object))
+            for field, dim in YearCube.LABEL_FIELDS.items():
+                if dim != name:
+                    continue
+                column, dtype = ('rating_sum', np.float64) if field == 'publisher_rating_sum' else ('games', np.int64)
+                full[field] = np.zeros((n_years + 1, len(labels)), dtype)
+                full[field][rows, codes] = frame[column].to_numpy()
+
+        cube = YearCube(
+            first_year,
+            {name: full[name][:n_years] for name in YearCube.FIELDS},
+            {name: full[name][n_years] for name in YearCube.FIELDS},
+        )
+        return dimensions, cube
+
+    def _query(self, sql, params=None):
+        with self.connection.cursor() as cursor:
+            return cursor.execute(sql, params or {}).fetchdf()
+
+    def _arrays(self):
+        for index in self.dimensions.values():
+            yield index.labels
+        for group in (self.cube.per_year, self.cube.unknown):
+            for name in self.cube.FIELDS:
+                yield np.asarray(group[name])
+
+    def top_games(self, start, end, n=5):
+        where, params = year_filter(start, end)
+        with stage('duckdb_top_games'):
+            games = self._query(f"""
+                SELECT row, name, positive_ratings, negative_ratings FROM steam
+                WHERE {where} ORDER BY positive_ratings DESC, row LIMIT {int(n)}
+            """, params)
+        return games.set_index('row').rename_axis(None)
+
+    def density(self, start, end, price_category, nbins=40):
+        where, params = year_filter(start, end)
+        points = f"""
+            SELECT positive_ratings::DOUBLE / (positive_ratings::DOUBLE + negative_ratings) AS x,
+                   price::DOUBLE AS y
+            FROM steam
+            WHERE {where} AND ({PRICE_SQL[price_category]})
+              AND positive_ratings::DOUBLE + negative_ratings > 0 AND price IS NOT NULL
+        """
+        with stage('duckdb_density') as rec:
+            bounds = self._query(f"SELECT count(*) AS n, min(x), max(x), min(y), max(y) FROM ({points})", params)
+            n, x_lo, x_hi, y_lo, y_hi = bounds.iloc[0]
+            rec['rows'] = int(n)
+            if n == 0:
+                return np.zeros(0), np.zeros(0), np.zeros((0, 0), dtype=np.int64)
+            x_edges, y_edges = _edges(x_lo, x_hi, nbins), _edges(y_lo, y_hi, nbins)
+            for name, edges in (('x', x_edges), ('y', y_edges)):
+                params[f'{name}_lo'] = float(edges[0])
+                params[f'{name}_scale'] = nbins / float(edges[-1] - edges[0])
+                params[f'{name}_edges'] = edges.tolist()
+            params['nbins'] = nbins
+            cells = self._query(f"""
+                SELECT {_bin_sql('x', 'x')} AS bx, {_bin_sql('y', 'y')} AS by, count(*) AS n
+                FROM ({points}) GROUP BY ALL
+            """, params)
+        z = np.zeros((nbins, nbins), dtype=np.int64)
+        z[cells['by'].to_numpy(), cells['bx'].to_numpy()] = cells['n'].to_numpy()
+        return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, z
+
+    def owner_genres(self, start, end):
+        where, params = year_filter(start, end)
+        genres = self._query(f"""
+            SELECT DISTINCT unnest({tokens_sql('genres', **DIMENSIONS['genres'])}) AS genre
+            FROM steam WHERE {where}
+        """, params)
+        return sorted(genres['genre'])
+
+    def owner_points(self, start, end, genre='Semua'):
+        # Unnest genre, isi owners kosong, agregat (genre, owners) dan Top-N
+        # di SQL; yang diambil hanya ringkasan per nilai owners dan baris
+        # detail yang benar-benar digambar. Pita owners dari ringkasan itu
+        # memakai charts.owner_bands seperti backend streaming
+        where, params = year_filter(start, end)
+        genre_clause = ''
+        if genre != 'Semua':
+            genre_clause = 'AND genre = $genre'
+            params['genre'] = genre
+        entries = f"""
+            WITH period AS (
+                SELECT row, name, publisher, genres, owners_mid, average_playtime FROM steam WHERE {where}
+            ), tokens AS (
+                -- Split sekali per nilai genres unik, bukan per baris
+                SELECT genres, unnest(tokens) AS genre, unnest(range(len(tokens))) AS position
+                FROM (SELECT genres, {tokens_sql('genres', **DIMENSIONS['genres'])} AS tokens
+                      FROM (SELECT DISTINCT genres FROM period))
+            ), entries AS (
+                SELECT row, name, publisher, genre, position,
+                       coalesce(owners_mid::DOUBLE, (SELECT avg(owners_mid::DOUBLE) FROM period)) AS owners,
+                       average_playtime::DOUBLE AS average_playtime
+                FROM period JOIN tokens ON period.genres IS NOT DISTINCT FROM tokens.genres
+            )
+            SELECT * FROM entries
+            WHERE owners IS NOT NULL AND average_playtime IS NOT NULL {genre_clause}
+        """
+        with stage('duckdb_owner_points') as rec:
+            groups = self._query(f"""
+                SELECT genre, owners, count(*) AS games, sum(average_playtime) AS playtime
+                FROM ({entries}) GROUP BY ALL ORDER BY genre, owners
+            """, params)
+            n_points = int(groups['games'].sum())
+            rec['rows'] = n_points
+            # Di atas budget hanya Top N (owners terbanyak, seri -> urutan
+            # baris) yang jadi titik detail, sama dengan compute._owner_points
+            order = 'owners DESC, row, position' if n_points > POLAR_POINT_BUDGET else 'row, position'
+            limit = f'LIMIT {POLAR_TOP_N}' if n_points > POLAR_POINT_BUDGET else ''
+            top = self._query(f"""
+                SELECT row, name, publisher, owners, average_playtime, genre
+                FROM ({entries}) ORDER BY {order} {limit}
+            """, params)
+
+        labels, codes = np.unique(groups['genre'].to_numpy(dtype=object), return_inverse=True)
+        genre_map = {g: i * 360 / len(labels) for i, g in enumerate(labels)}
+        if n_points > POLAR_POINT_BUDGET:
+            df_owner_bins = owner_bands(
+                codes, groups['owners'].to_numpy(), groups['playtime'].to_numpy(), labels,
+                counts=groups['games'].to_numpy(),
+            )
+            df_owner_bins['theta'] = df_owner_bins['genres'].map(genre_map)
+        else:
+            df_owner_bins = None
+
+        df_owner = top.set_index('row').rename_axis(None)[['name', 'publisher', 'owners', 'average_playtime']]
+        df_owner['genres'] = top['genre'].to_numpy(dtype=object)
+        df_owner['theta'] = top['genre'].map(genre_map).to_numpy(dtype=np.float64)
+        df_owner['owners_scaled'] = df_owner['owners']
+        df_owner['marker_size'] = np.clip(df_owner['average_playtime'] / 60, 5, 20)
+        return df_owner, df_owner_bins, genre_map, n_points
@@ -0,0 +1,318 @@
+"""Ekspor semua tampilan preset dashboard ke file statis (HTML + JSON).
+
+Contoh:
+    python scripts/export.py                        # data/steam.csv -> data/steam.export/
+    python scripts/export.py data/steam.csv --out public/ --force
+
+Untuk tiap kombinasi (periode preset x kategori harga x genre) ditulis satu
+halaman ``pages/<periode>/<harga>/<genre>.html`` berisi kartu KPI dan
+fig1-fig8, dengan selector yang berpindah antar halaman. Figure disimpan
+sekali sebagai JSON Plotly di ``figures/`` dengan nama = hash isinya, jadi
+figure yang sama (mis. fig1 untuk semua genre) hanya satu file dan aman
+di-cache selamanya oleh CDN. plotly.min.js ikut disalin; hasilnya bisa
+disajikan file server biasa tanpa Python. ``manifest.json`` (ditulis
+paling akhir) memetakan tiap kombinasi ke halaman, figure dan nilai KPI-nya.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import time
+
+import plotly
+from plotly.offline import get_plotlyjs
+
+import compute
+import figures
+from charts import PRICE_CATEGORIES
+from compute import PERIODS
+from ingest import dataset_version, read_deltas, write_atomic
+from profiling import stage
+from watcher import BACKENDS, DatasetWatcher
+
+# Naikkan setiap kali struktur halaman/manifest berubah
+EXPORT_VERSION = 1
+DENSITY_BINS = 40
+TOP_GAMES_N = 5
+
+
+def export_dir_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.export'
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def export_is_fresh(csv_path, manifest):
+    return (
+        manifest is not None
+        and manifest.get('version') == EXPORT_VERSION
+        and manifest.get('dataset') == dataset_version(csv_path)
+        and manifest.get('deltas') == [entry['sha256'] for entry in read_deltas(csv_path)]
+    )
+
+
+def slug(text):
+    """Nama file dari label ('2010s (2010 - 2019)' -> '2010s-2010-2019')."""
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or hashlib.sha1(str(text).encode()).hexdigest()[:8]
+
+
+def unique_slugs(labels):
+    """label -> slug, dijamin unik dalam satu daftar (bentrok diberi hash)."""
+    slugs, used = {}, set()
+    for label in labels:
+        name = slug(label)
+        if name in used:
+            name = f"{name}-{hashlib.sha1(str(label).encode()).hexdigest()[:8]}"
+        slugs[label] = name
+        used.add(name)
+    return slugs
+
+
+def write_text(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    write_atomic(path, write)
+
+
+def save_figure(directory, fig):
+    """Tulis JSON figure (sekali per isi); kembalikan path relatifnya."""
+    fig_json = fig.to_json()
+    name = f"figures/{hashlib.sha1(fig_json.encode()).hexdigest()[:20]}.json"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        write_text(path, fig_json)
+    return name
+
+
+def _plain(value):
+    # numpy scalar -> tipe Python supaya bisa ditulis ke JSON
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _script_json(value):
+    return json.dumps(value, ensure_ascii=False).replace('</', '<\\/')
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>Steam Dashboard - {title}</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+{kpi_style}
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 1200px; padding: 16px; color: #262730; }}
+.filters {{ display: flex; gap: 16px; flex-wrap: wrap; margin-bottom: 16px; }}
+.grid-4 {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px; }}
+.grid-2 {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 16px; }}
+</style>
+<script src="{root}plotly.min.js"></script>
+</head>
+<body>
+<h1 class="title">Dashboard Tren Game Steam 🎮</h1>
+<p>Dibuat oleh <b>Cognito Team.</b> Data versi {version}.</p>
+<div class="filters">
+<label>Periode Waktu: <select id="period"></select></label>
+<label>Pilih Kategori Harga: <select id="price"></select></label>
+<label>Pilih Genre: <select id="genre"></select></label>
+</div>
+<hr>
+<div class="grid-4">{kpi_cards}</div>
+<hr>
+<h3>Tren Perilisan Game per Tahun</h3>
+<div class="figure" data-src="{root}{fig1}"></div>
+<div class="grid-2">
+<div><h3>Top 5 Game Terpopuler</h3><div class="figure" data-src="{root}{fig2}"></div></div>
+<div><h3>Top 5 Genre Tepopuler</h3><div class="figure" data-src="{root}{fig3}"></div></div>
+</div>
+<div class="grid-2">
+<div><h3>Top 5 Publisher Terfavorit</h3>{no_publisher}<div class="figure" data-src="{root}{fig4}"></div></div>
+<div><h3>Distribusi Harga Game (Gratis vs Berbayar)</h3><div class="figure" data-src="{root}{fig5}"></div></div>
+</div>
+<hr>
+<h3>Distribusi Game Berdasarkan Rasio Review Positif dan Harga Game</h3>
+<div class="figure" data-src="{root}{fig7}"></div>
+<hr>
+<h3>Sebaran Jumlah Pemain (Owners) terhadap Rata-rata Durasi Bermain</h3>
+<div class="figure" data-src="{root}{fig8}"></div>
+<script>
+const ROOT = {root_json};
+const NAV = {nav};
+const CURRENT = {current};
+function fill(id, options, selected) {{
+  const select = document.getElementById(id);
+  for (const [label, value] of options) {{
+    select.add(new Option(label, value, false, value === selected));
+  }}
+  select.addEventListener('change', go);
+}}
+function go() {{
+  const period = document.getElementById('period').value;
+  const price = document.getElementById('price').value;
+  let genre = document.getElementById('genre').value;
+  // Genre yang tidak ada di periode tujuan kembali ke 'Semua'
+  if (!NAV.genres[period].some(([, value]) => value === genre)) genre = NAV.genres[period][0][1];
+  location.href = `${{ROOT}}pages/${{period}}/${{price}}/${{genre}}.html`;
+}}
+fill('period', NAV.periods, CURRENT.period);
+fill('price', NAV.prices, CURRENT.price);
+fill('genre', NAV.genres[CURRENT.period], CURRENT.genre);
+for (const el of document.querySelectorAll('.figure')) {{
+  fetch(el.dataset.src).then(r => r.json()).then(fig => Plotly.newPlot(el, fig.data, fig.layout, {{responsive: true}}));
+}}
+</script>
+</body>
+</html>
+"""
+
+
+def render_page(version, kpi, selection, figure_files, nav, has_publishers):
+    root = '../../../'  # pages/<periode>/<harga>/<genre>.html
+    return PAGE_TEMPLATE.format(
+        title=html.escape(' / '.join(selection['labels'])),
+        version=html.escape(version[:12]),
+        kpi_style=figures.KPI_STYLE,
+        kpi_cards=''.join(figures.kpi_cards(kpi)),
+        no_publisher='' if has_publishers else '<p>Tidak ada data publisher tersedia.</p>',
+        root=root,
+        root_json=_script_json(root),
+        nav=_script_json(nav),
+        current=_script_json(selection['slugs']),
+        **figure_files,
+    )
+
+
+def export(csv_path, out_dir=None, mode='memory', force=False):
+    """Tulis semua tampilan preset ke ``out_dir``; manifest ditulis paling akhir."""
+    directory = out_dir or export_dir_for(csv_path)
+    if not force and export_is_fresh(csv_path, read_manifest(directory)):
+        return None
+    t0 = time.perf_counter()
+
+    # Versi yang sama dengan yang dilihat app.py: snapshot/artefak + delta
+    dataset = DatasetWatcher(csv_path, mode).load()
+    data = dataset.data
+
+    period_slugs = unique_slugs(PERIODS)
+    price_slugs = unique_slugs(PRICE_CATEGORIES)
+    genres = {period: ['Semua'] + data.owner_genres(*PERIODS[period][0]) for period in PERIODS}
+    genre_slugs = {period: unique_slugs(genres[period]) for period in PERIODS}
+    nav = {
+        'periods': [[label, period_slugs[label]] for label in PERIODS],
+        'prices': [[label, price_slugs[label]] for label in PRICE_CATEGORIES],
+        'genres': {
+            period_slugs[period]: [[label, genre_slugs[period][label]] for label in genres[period]]
+            for period in PERIODS
+        },
+    }
+
+    views, kpis = [], {}
+    os.makedirs(directory, exist_ok=True)
+    for period in PERIODS:
+        with stage(f'export[{period}]') as rec:
+            start, end, current, prev = compute.preset_windows(data.cube, period)
+            kpi = compute.kpis(data.dimensions, current, prev)
+            kpis[period] = {key: _plain(value) for key, value in kpi.items()}
+            period_figures = {
+                'fig1': save_figure(directory, figures.fig1(data.cube.games_per_year(start, end))),
+                'fig2': save_figure(directory, figures.fig2(data.top_games(start, end, n=TOP_GAMES_N))),
+                'fig3': save_figure(directory, figures.fig3(compute.top_genres(data.dimensions, current, n=5))),
+                'fig4': save_figure(directory, figures.fig4(compute.top_publishers(data.dimensions, current, n=5))),
+                'fig5': save_figure(directory, figures.fig5(compute.price_distribution(current))),
+            }
+            density_figures = {
+                price: save_figure(directory, figures.fig7(*data.density(start, end, price, nbins=DENSITY_BINS)))
+                for price in PRICE_CATEGORIES
+            }
+            owner_figures = {
+                genre: save_figure(directory, figures.fig8(*data.owner_points(start, end, genre)))
+                for genre in genres[period]
+            }
+
+            for price in PRICE_CATEGORIES:
+                for genre in genres[period]:
+                    selection = {
+                        'labels': [period, price, genre],
+                        'slugs': {
+                            'period': period_slugs[period],
+                            'price': price_slugs[price],
+                            'genre': genre_slugs[period][genre],
+                        },
+                    }
+                    figure_files = {**period_figures, 'fig7': density_figures[price], 'fig8': owner_figures[genre]}
+                    page = 'pages/{period}/{price}/{genre}.html'.format(**selection['slugs'])
+                    write_text(os.path.join(directory, page), render_page(
+                        dataset.version, kpi, selection, figure_files, nav, (current.publisher_games > 0).any(),
+                    ))
+                    views.append({
+                        'period': period, 'price_category': price, 'genre': genre,
+                        'page': page, 'figures': figure_files,
+                    })
+            rec['rows'] = len(PRICE_CATEGORIES) * len(genres[period])
+
+    write_text(os.path.join(directory, 'plotly.min.js'), get_plotlyjs())
+    default_page = views[0]['page']
+    write_text(os.path.join(directory, 'index.html'), (
+        f'<!DOCTYPE html><meta charset="utf-8"><meta http-equiv="refresh" content="0; url={default_page}">'
+        f'<a href="{default_page}">Steam Dashboard</a>\n'
+    ))
+
+    manifest = {
+        'version': EXPORT_VERSION,
+        'dataset': dataset.version,
+        'deltas': list(dataset.deltas),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'plotly': plotly.__version__,
+        'index': 'index.html',
+        'kpis': kpis,
+        'views': views,
+        'seconds': round(time.perf_counter() - t0, 3),
+    }
+    write_text(os.path.join(directory, 'manifest.json'), json.dumps(manifest, indent=2, ensure_ascii=False))
+    _prune(directory, manifest)
+    return manifest
+
+
+def _prune(directory, manifest):
+    # Halaman/figure dari ekspor lama yang tidak dirujuk manifest baru
+    keep = {view['page'] for view in manifest['views']}
+    keep.update(path for view in manifest['views'] for path in view['figures'].values())
+    for sub in ('pages', 'figures'):
+        for dirpath, _, filenames in os.walk(os.path.join(directory, sub), topdown=False):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if os.path.relpath(path, directory).replace(os.sep, '/') not in keep:
+                    os.remove(path)
+            if dirpath != os.path.join(directory, sub) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ekspor tampilan preset dashboard ke HTML/JSON statis.')
+    parser.add_argument('csv', nargs='?', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'steam.csv'
+    ))
+    parser.add_argument('--out', help='folder tujuan (default: <csv>.export/)')
+    parser.add_argument('--mode', choices=list(BACKENDS), default='memory', help='backend query')
+    parser.add_argument('--force', action='store_true', help='ekspor ulang walau masih cocok')
+    args = parser.parse_args()
+
+    manifest = export(args.csv, out_dir=args.out, mode=args.mode, force=args.force)
+    out = args.out or export_dir_for(args.csv)
+    if manifest is None:
+        print(f"Ekspor di {out} masih cocok dengan {args.csv}")
+    else:
+        n_figures = len({path for view in manifest['views'] for path in view['figures'].values()})
+        print(f"{len(manifest['views'])} tampilan, {n_figures} figure, {manifest['seconds']:.3f} detik")
+        print(f"Ekspor ditulis ke {out}")
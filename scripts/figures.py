@@ -0,0 +1,333 @@
+"""Kartu KPI dan figure dashboard (fig1-fig8) tanpa Streamlit.
+
+Setiap fungsi menerima hasil query yang sudah jadi (compute.py / method
+SteamData) dan mengembalikan HTML atau ``go.Figure``, jadi app.py dan
+export.py menggambar tampilan yang persis sama.
+"""
+import html
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from charts import POLAR_WEBGL_THRESHOLD
+
+KPI_STYLE = """
+<style>
+.title {
+    font-size: 36px;
+    font-weight: 700;
+    color: #262730;
+}
+.kpi-box {
+    background: #F0F2F6;
+    padding: 12px;
+    border-radius: 12px;
+    text-align: center;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    border-left: 4px solid #0068C9;
+    min-height: 150px;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+}
+.kpi-value {
+    font-size: 32px;
+    font-weight: 700;
+    margin-bottom: -10px;
+    color: #0068C9;
+}
+.kpi-label {
+    font-size: 16px;
+    color: #262730;
+}
+.kpi-delta {
+    text: None;
+}
+.kpi-error {
+    font-size: 12px;
+    color: #6B6B6B;
+}
+.kpi-delta-pos {
+    display: inline-block;
+    font-size: 14px;
+    color: #37C900;
+    # background-color: #02FF20;
+}
+.kpi-delta-neg {
+    font-size: 14px;
+    color: #C90000;
+    # background-color: #FF4B4B;
+}
+</style>
+"""
+
+# Warna bar Top 5, dari peringkat 1 ke 5
+TOP5_COLORS = ['#0068C9', '#3286d3', '#66a4de', '#99c2e9', '#e5eff9']
+
+
+def kpi_cards(kpi, kpi_error=''):
+    """HTML empat kartu KPI (Total Games, Publisher, Genre, Harga) dari compute.kpis."""
+    total_games = kpi['total_games']
+    avg_price_current = kpi['avg_price']
+    delta_games = kpi['delta_games']
+    delta_price_abs = kpi['delta_price_abs']
+    delta_price_pct = kpi['delta_price_pct']
+
+    if delta_games is not None:
+        games_card = f"""
+            <div class="kpi-box">
+                <div class="kpi-label">Total Games</div>
+                <div class="kpi-value">
+                    {total_games:,}
+                    <span class="{ 'kpi-delta-pos' if delta_games >= 0 else 'kpi-delta-neg' }">
+                        {delta_games:+,}
+                    </span>
+                </div>
+                <div style="color: #3B3B3B; margin-top: 4px; font-size: 14px">Periode Sebelumnya</div>
+                {kpi_error}
+            </div>
+        """
+    else:
+        games_card = f"""
+            <div class="kpi-box">
+                <div class="kpi-label">Total Games</div>
+                <div class="kpi-value">{total_games:,}</div>
+                <div class="kpi-delta"></div>
+                {kpi_error}
+            </div>
+        """
+    publisher_card = f"""
+        <div class="kpi-box">
+            <div class="kpi-label">Publisher Terfavorit</div>
+            <div class="kpi-value">{html.escape(str(kpi['most_common_publisher']))}</div>
+            {kpi_error}
+        </div>
+    """
+    genre_card = f"""
+        <div class="kpi-box">
+            <div class="kpi-label">Genre Terpopuler</div>
+            <div class="kpi-value">{html.escape(str(kpi['most_common_genre']))}</div>
+            {kpi_error}
+        </div>
+    """
+    if delta_price_abs is not None:
+        price_card = f"""
+            <div class="kpi-box">
+                <div class="kpi-label">Harga Rata-rata</div>
+                <div class="kpi-value">
+                    £{avg_price_current:.2f}
+                    <span class="{ 'kpi-delta-neg' if delta_price_abs >= 0 else 'kpi-delta-pos' }">
+                    {delta_price_abs:+.2f}£ ({delta_price_pct:+.1f}%)
+                    </span>
+                </div>
+                <div style="color: #3B3B3B; margin-top: 4px; font-size: 14px">Periode Sebelumnya</div>
+                {kpi_error}
+            </div>
+        """
+    else:
+        price_card = f"""
+            <div class="kpi-box">
+                <div class="kpi-label">Harga Rata-rata</div>
+                <div class="kpi-value">£{avg_price_current:.2f}</div>
+                <div class="kpi-delta"></div>
+                {kpi_error}
+            </div>
+        """
+    return [games_card, publisher_card, genre_card, price_card]
+
+
+def fig1(games_per_year):
+    """Tren perilisan game per tahun (YearCube.games_per_year)."""
+    fig1 = px.line(
+        games_per_year,
+        x='release_year',
+        y='count',
+        markers=True,
+        color_discrete_map={'count': '#0068C9'},
+        labels={'release_year': 'Tahun Rilis', 'count': 'Jumlah Game'},
+        line_shape='spline'
+    )
+    fig1.update_traces(line_color='royalblue', line_width=3)
+    fig1.update_layout(
+        template='plotly_white',
+        xaxis=dict(tickmode='linear', tick0=1990, dtick=2),
+        yaxis_title='Jumlah Game Dirilis',
+        hovermode='x unified'
+    )
+    return fig1
+
+
+def fig2(top5_games):
+    """Top 5 game terpopuler (review positif vs negatif)."""
+    top5_games_melted = top5_games.melt(id_vars='name', value_vars=['positive_ratings', 'negative_ratings'],
+                                        var_name='review_type', value_name='count')
+    fig2 = px.bar(
+        top5_games_melted,
+        x='name',
+        y='count',
+        color='review_type',
+        barmode='group',
+        labels={'name': 'Nama Game', 'count': 'Jumlah Review', 'review_type': 'Tipe Review'},
+        color_discrete_map={'positive_ratings': '#0068C9', 'negative_ratings': '#64B5F6'}
+    )
+    fig2.update_layout(
+        template='plotly_white',
+        xaxis_title='Nama Game',
+        yaxis_title='Jumlah Review',
+        hovermode='x unified'
+    )
+    return fig2
+
+
+def fig3(top5_genres):
+    """Top 5 genre (compute.top_genres)."""
+    fig3 = px.bar(
+        top5_genres,
+        x='genre',
+        y='count',
+        labels={'genre': 'Genre', 'count': 'Jumlah Game'},
+        color='genre',
+        color_discrete_map=dict(zip(top5_genres['genre'], TOP5_COLORS))
+    )
+
+    fig3.update_layout(
+        template='plotly_white',
+        xaxis_title='Genre',
+        yaxis_title='Jumlah Game',
+        hovermode='x unified'
+    )
+    return fig3
+
+
+def fig4(top5_publishers):
+    """Top 5 publisher menurut rata-rata review positif (compute.top_publishers)."""
+    fig4 = px.bar(
+        top5_publishers,
+        x='publisher',
+        y='positive_ratings',
+        labels={'publisher': 'Publisher', 'positive_ratings': 'Rata-rata Review Positif'},
+        color='publisher',
+        color_discrete_map=dict(zip(top5_publishers['publisher'], TOP5_COLORS))
+    )
+    fig4.update_layout(
+        template='plotly_white',
+        xaxis_title='Publisher',
+        yaxis_title='Rata-rata Review Positif',
+        hovermode='x unified'
+    )
+    return fig4
+
+
+def fig5(price_distribution):
+    """Pie gratis vs berbayar (compute.price_distribution)."""
+    fig5 = px.pie(
+        price_distribution,
+        names='price_category',
+        values='count',
+        color='price_category',
+        color_discrete_map={'Gratis': '#64B5F6', 'Berbayar': '#0068C9'},
+    )
+    fig5.update_traces(
+        pull=[0 if cat == 'Gratis' else 0.1 for cat in price_distribution['price_category']]
+    )
+    fig5.update_layout(
+        template='plotly_white',
+        hovermode='x unified'
+    )
+    return fig5
+
+
+def fig7(density_x, density_y, density_z):
+    """Heatmap rasio review positif vs harga (matriks dari SteamData.density)."""
+    fig7 = go.Figure(go.Heatmap(
+        x=density_x,
+        y=density_y,
+        z=density_z,
+        colorscale='Blues',
+        colorbar=dict(title='count'),
+        hovertemplate=(
+            'Persentase Ulasan Positif=%{x}<br>'
+            'Harga (£)=%{y}<br>'
+            'count=%{z}<extra></extra>'
+        )
+    ))
+    fig7.update_layout(
+        template='plotly_white',
+        xaxis_title='Persentase Ulasan Positif',
+        yaxis_title='Harga (£)',
+        width=1100,
+        height=650
+    )
+    return fig7
+
+
+def fig8(df_owner, df_owner_bins, genre_map, n_points):
+    """Scatterpolar owners vs playtime (hasil SteamData.owner_points)."""
+    # Di atas ambang pakai WebGL
+    ScatterTrace = go.Scatterpolargl if n_points > POLAR_WEBGL_THRESHOLD else go.Scatterpolar
+    # Skala warna sama untuk trace ringkasan dan trace detail
+    owners_range = dict(cmin=df_owner['owners_scaled'].min(), cmax=df_owner['owners_scaled'].max())
+    if df_owner_bins is not None:
+        owners_range = dict(
+            cmin=min(owners_range['cmin'], df_owner_bins['owners'].min()),
+            cmax=max(owners_range['cmax'], df_owner_bins['owners'].max()),
+        )
+
+    fig8 = go.Figure()
+
+    if df_owner_bins is not None:
+        fig8.add_trace(ScatterTrace(
+            r=df_owner_bins['owners'],
+            theta=df_owner_bins['theta'],
+            mode='markers',
+            marker=dict(
+                size=df_owner_bins['marker_size'],
+                color=df_owner_bins['owners'],
+                colorscale='RdBu',
+                opacity=0.6,
+                **owners_range
+            ),
+            hovertemplate=(
+                "Genre: %{customdata[0]}<br>"
+                "Jumlah Owner: %{r}<br>"
+                "Jumlah Game: %{customdata[1]:,}<br>"
+                "Rata-rata Playtime: %{customdata[2]:.0f} menit<extra></extra>"
+            ),
+            customdata=df_owner_bins[['genres', 'games', 'average_playtime']]
+        ))
+
+    fig8.add_trace(ScatterTrace(
+        r=df_owner['owners_scaled'],
+        theta=df_owner['theta'],
+        mode='markers',
+        marker=dict(
+            size=df_owner['marker_size'],
+            color=df_owner['owners_scaled'],
+            colorscale='RdBu',
+            showscale=True,
+            colorbar=dict(title='Jumlah Pemain'),
+            **owners_range
+        ),
+        hovertemplate=(
+            "<b>%{text}</b><br>"
+            "Genre: %{customdata[1]}<br>"
+            "Jumlah Owner: %{r}<br>"
+            "Rata-rata Playtime: %{marker.size} menit<br>"
+            "Publisher: %{customdata[0]}<extra></extra>"
+        ),
+        text=df_owner['name'],
+        customdata=df_owner[['publisher', 'genres']]
+    ))
+    fig8.update_layout(
+        template='seaborn',
+        polar=dict(
+            radialaxis=dict(type='log'),
+            angularaxis=dict(
+                tickmode='array',
+                tickvals=list(genre_map.values()),
+                ticktext=list(genre_map.keys())
+            )
+        ),
+        showlegend=False
+    )
+    return fig8
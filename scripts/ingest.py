@@ -0,0 +1,416 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from profiling import stage
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # snapshot opsional, tanpa pyarrow tetap baca CSV
+    pa = None
+
+# Naikkan setiap kali kolom/dtype hasil ingest berubah
+SNAPSHOT_VERSION = 4
+
+# Hanya kolom yang dipakai dashboard, dengan dtype yang ringkas. Kolom angka
+# dibaca float32 supaya sel kosong tidak gagal diparse (lihat prepare_frame)
+CSV_DTYPES = {
+    'appid': 'int64',
+    'name': 'string',
+    'genres': 'category',
+    'publisher': 'category',
+    'price': 'float32',
+    'positive_ratings': 'float32',
+    'negative_ratings': 'float32',
+    'owners': 'category',
+    'average_playtime': 'float32',
+}
+# Jumlah review kosong dianggap 0 lalu diturunkan ke int32; playtime kosong
+# tetap NaN (titik tanpa playtime dilewati chart owners)
+COUNT_COLUMNS = ('positive_ratings', 'negative_ratings')
+CSV_COLUMNS = ['name', 'release_date', *[c for c in CSV_DTYPES if c != 'name']]
+
+
+def parse_owner_ranges(owners):
+    """'20,000-50,000' -> (batas bawah, batas atas, titik tengah) float32.
+
+    Diparse per kategori unik dengan operasi string vektor; nilai tunggal
+    ('50000+') dipakai sebagai bawah sekaligus atas, nilai rusak jadi NaN.
+    """
+    cat = owners if isinstance(owners.dtype, pd.CategoricalDtype) else owners.astype('category')
+    text = pd.Series(cat.cat.categories, dtype='string').str.replace(r'[,+\s]', '', regex=True)
+    parts = text.str.split('-', n=1, expand=True).reindex(columns=[0, 1])
+    low = pd.to_numeric(parts[0], errors='coerce')
+    high = pd.to_numeric(parts[1], errors='coerce').where(parts[1].notna(), low)
+
+    codes = cat.cat.codes.to_numpy()
+    result = {}
+    for name, values in (('low', low), ('high', high), ('mid', (low + high) / 2)):
+        # Kode -1 (NaN) diarahkan ke slot NaN di ujung array
+        lookup = np.append(values.to_numpy(dtype=np.float32, na_value=np.nan), np.float32('nan'))
+        result[name] = lookup[codes]
+    return result['low'], result['high'], result['mid']
+
+
+def read_steam_csv(path):
+    with stage('read_csv') as rec:
+        df = pd.read_csv(path, usecols=CSV_COLUMNS, dtype=CSV_DTYPES)
+        rec['rows'] = len(df)
+    return prepare_frame(df)
+
+
+def iter_steam_csv(path, chunk_rows=200_000):
+    """Seperti read_steam_csv, tapi per potongan ``chunk_rows`` baris.
+
+    Memori puncak sebanding ukuran potongan, bukan ukuran file; kategori
+    tiap potongan berdiri sendiri.
+    """
+    reader = pd.read_csv(path, usecols=CSV_COLUMNS, dtype=CSV_DTYPES, chunksize=chunk_rows)
+    with reader:
+        for chunk in reader:
+            yield prepare_frame(chunk)
+
+
+def prepare_frame(df):
+    with stage('parse_release_date', rows=len(df)):
+        df['release_date'] = pd.to_datetime(df['release_date'], format='ISO8601', errors='coerce')
+        df['release_year'] = df['release_date'].dt.year.astype('float32')
+    for col in COUNT_COLUMNS:
+        df[col] = df[col].fillna(0).astype('int32')
+    with stage('parse_owners', rows=len(df)):
+        df['owners_low'], df['owners_high'], df['owners_mid'] = parse_owner_ranges(df['owners'])
+    return df
+
+
+def snapshot_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.feather'
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_atomic(path, write):
+    """Panggil ``write(tmp_path)`` lalu ganti ``path`` dengan os.replace.
+
+    Proses yang sedang mmap file lama tetap membaca isi lama; pembaca baru
+    tidak pernah melihat file setengah jadi.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def source_info(csv_path):
+    stat = os.stat(csv_path)
+    return {'mtime': stat.st_mtime, 'size': stat.st_size}
+
+
+def read_snapshot_meta(snapshot_path):
+    if pa is None or not os.path.exists(snapshot_path):
+        return None
+    try:
+        with pa.memory_map(snapshot_path) as source:
+            schema = pa.ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+    raw = (schema.metadata or {}).get(b'steam_snapshot')
+    return json.loads(raw) if raw else None
+
+
+def snapshot_is_fresh(csv_path, snapshot_path):
+    meta = read_snapshot_meta(snapshot_path)
+    if meta is None or meta.get('version') != SNAPSHOT_VERSION:
+        return False
+    info = source_info(csv_path)
+    if meta['mtime'] == info['mtime'] and meta['size'] == info['size']:
+        return True
+    # mtime berubah (mis. file di-copy ulang) tapi isinya bisa saja sama
+    return meta['size'] == info['size'] and meta['sha256'] == file_sha256(csv_path)
+
+
+def build_snapshot(csv_path, snapshot_path=None):
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    info = source_info(csv_path)
+    df = read_steam_csv(csv_path)
+
+    meta = {'version': SNAPSHOT_VERSION, 'sha256': file_sha256(csv_path), **info}
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'steam_snapshot': json.dumps(meta).encode(),
+    })
+
+    # Tanpa kompresi supaya file bisa di-mmap langsung; tulis ke tmp lalu
+    # os.replace agar proses lain tidak pernah membaca file setengah jadi
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with stage('write_snapshot', rows=len(df)):
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def load_snapshot(snapshot_path):
+    # memory_map: buffer kolom numerik menunjuk ke page cache yang sama di
+    # semua proses server, bukan salinan privat hasil parse
+    with stage('load_snapshot') as rec:
+        table = feather.read_table(snapshot_path, memory_map=True)
+        rec['rows'] = table.num_rows
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def dataset_version(csv_path):
+    """Hash sumber data; dipakai sebagai versi untuk cache turunan (figure dll)."""
+    meta = read_snapshot_meta(snapshot_path_for(csv_path))
+    if meta is not None and meta.get('version') == SNAPSHOT_VERSION:
+        return meta['sha256']
+    return file_sha256(csv_path)
+
+
+def load_dataset(csv_path):
+    if pa is None:
+        return read_steam_csv(csv_path)
+    snapshot_path = snapshot_path_for(csv_path)
+    if not snapshot_is_fresh(csv_path, snapshot_path):
+        build_snapshot(csv_path, snapshot_path)
+    return load_snapshot(snapshot_path)
+
+
+def parquet_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def parquet_snapshot(csv_path, row_group_rows=128 * 1024):
+    """Salinan Parquet snapshot untuk engine SQL (duckdb_backend.py).
+
+    Isi dan metadata sama dengan snapshot Feather; row group dengan
+    statistik min/max per kolom memungkinkan predicate pushdown. Dibangun
+    ulang hanya bila snapshot Feather-nya berganti versi.
+    """
+    snapshot_path = snapshot_path_for(csv_path)
+    if not snapshot_is_fresh(csv_path, snapshot_path):
+        build_snapshot(csv_path, snapshot_path)
+    meta = read_snapshot_meta(snapshot_path)
+    parquet_path = parquet_path_for(csv_path)
+    if os.path.exists(parquet_path):
+        raw = (pq.read_schema(parquet_path).metadata or {}).get(b'steam_snapshot')
+        if raw and json.loads(raw) == meta:
+            return parquet_path
+
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    with stage('write_parquet') as rec:
+        table = feather.read_table(snapshot_path, memory_map=True)
+        rec['rows'] = table.num_rows
+        pq.write_table(table, tmp_path, row_group_size=row_group_rows)
+    os.replace(tmp_path, parquet_path)
+    return parquet_path
+
+
+def _readonly(arr):
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+class _ReadOnlyIndexer:
+    """``loc``/``iloc``/``at``/``iat`` ReadOnlyFrame: baca boleh, tulis ditolak."""
+
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __setitem__(self, key, value):
+        raise ValueError(ReadOnlyFrame.READ_ONLY_MESSAGE)
+
+    def __call__(self, *args, **kwargs):
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._indexer, name)
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """DataFrame bersama antar session yang menolak semua penulisan.
+
+    Ganti/tambah/hapus kolom (``df[col] = ...``, ``df[col] += 1``),
+    ``loc``/``iloc``/``at``/``iat``, method ``inplace=True`` dan ganti
+    ``columns``/``index`` gagal dengan ValueError. Hasil turunannya (mask,
+    take, pilih kolom, ``copy()``) adalah DataFrame biasa milik session.
+    """
+
+    READ_ONLY_MESSAGE = 'DataFrame bersama read-only; ubah salinannya (df.copy())'
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _refuse(self, *args, **kwargs):
+        raise ValueError(self.READ_ONLY_MESSAGE)
+
+    __setitem__ = __delitem__ = _refuse
+    insert = pop = isetitem = update = _update_inplace = _refuse
+
+    def __setattr__(self, name, value):
+        if name in ('columns', 'index'):
+            self._refuse()
+        super().__setattr__(name, value)
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+
+def _refuse_inplace(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get('inplace'):
+            self._refuse()
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Semua method yang punya argumen inplace (fillna, where, drop, ...)
+for _name, _method in inspect.getmembers(pd.DataFrame, inspect.isfunction):
+    if not _name.startswith('_') and 'inplace' in inspect.signature(_method).parameters:
+        setattr(ReadOnlyFrame, _name, _refuse_inplace(_method))
+del _name, _method
+
+
+def freeze_frame(df):
+    """ReadOnlyFrame dengan kolom yang sama (tanpa salinan) dan buffer read-only.
+
+    Dipakai untuk dataset yang dibagi antar session: penulisan lewat frame
+    ditolak ReadOnlyFrame, tulis lewat ``.to_numpy()`` gagal karena buffer
+    read-only, sedangkan operasi biasa (mask, groupby, nlargest) tetap jalan.
+    """
+    columns = {}
+    for name, col in df.items():
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            # Categorical.codes sudah view read-only; from_codes memakainya apa adanya
+            columns[name] = pd.Categorical.from_codes(col.array.codes, dtype=col.dtype, validate=False)
+        elif isinstance(col.dtype, np.dtype):
+            columns[name] = _readonly(col.to_numpy())
+        else:
+            # Array Arrow (kolom string) tidak bisa dikunci dari sini; perubahan
+            # lewat ``.array`` terdeteksi lewat SharedData.is_unchanged()
+            columns[name] = col.array
+    return ReadOnlyFrame(columns, index=df.index, copy=False)
+
+
+def concat_frames(*frames):
+    """Gabung frame hasil ingest; kategori disatukan, bukan jatuh ke object."""
+    columns = {}
+    for name in frames[0].columns:
+        parts = [frame[name] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[name] = union_categoricals(parts, ignore_order=True)
+        else:
+            columns[name] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+# Delta harian: tiap file delta disimpan sebagai segmen Feather tersendiri
+# di samping snapshot, dicatat berurutan di manifest JSON. Manifest mengikat
+# delta ke sha256 steam.csv; bila steam.csv diganti, delta lama diabaikan.
+def deltas_manifest_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.deltas.json'
+
+
+def read_deltas(csv_path, version=None):
+    """Entri delta ({'sha256', 'path', 'rows'}) untuk versi steam.csv saat ini.
+
+    ``version`` (hasil dataset_version yang sudah diketahui) menghemat
+    pembacaan ulang metadata snapshot atau hash file.
+    """
+    try:
+        with open(deltas_manifest_path(csv_path)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if manifest.get('base_sha256') != (version or dataset_version(csv_path)):
+        return []
+    return manifest['deltas']
+
+
+def load_delta(entry):
+    with stage('load_delta') as rec:
+        if pa is None:
+            df = read_steam_csv(entry['source'])
+        else:
+            df = feather.read_table(entry['path'], memory_map=True).to_pandas(split_blocks=True, self_destruct=True)
+        rec['rows'] = len(df)
+    return df
+
+
+def add_delta(csv_path, delta_csv_path):
+    """Parse satu file delta (skema steam.csv) dan catat di manifest.
+
+    Biaya sebanding ukuran delta: hanya file delta yang diparse dan ditulis.
+    Proses dashboard yang berjalan menerapkannya saat rerun berikutnya.
+    """
+    sha256 = file_sha256(delta_csv_path)
+    deltas = read_deltas(csv_path)
+    if any(entry['sha256'] == sha256 for entry in deltas):
+        return None
+    df = read_steam_csv(delta_csv_path)
+    entry = {'sha256': sha256, 'source': os.path.abspath(delta_csv_path), 'rows': len(df), 'path': None}
+    if pa is not None:
+        entry['path'] = f"{os.path.splitext(csv_path)[0]}.delta-{sha256[:16]}.feather"
+        tmp_path = f"{entry['path']}.{os.getpid()}.tmp"
+        with stage('write_delta', rows=len(df)):
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, entry['path'])
+
+    manifest = {'base_sha256': dataset_version(csv_path), 'deltas': deltas + [entry]}
+
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    write_atomic(deltas_manifest_path(csv_path), write)
+    return entry
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Bangun snapshot steam.csv atau tambahkan file delta.')
+    parser.add_argument('csv', nargs='?', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'steam.csv'
+    ))
+    parser.add_argument('--delta', nargs='+', default=[], help='file CSV delta (game baru/diperbarui, kunci appid)')
+    args = parser.parse_args()
+
+    if not args.delta:
+        print(f"Snapshot ditulis ke {build_snapshot(args.csv)}")
+    for delta in args.delta:
+        entry = add_delta(args.csv, delta)
+        if entry is None:
+            print(f"{delta}: sudah tercatat")
+        else:
+            print(f"{delta}: {entry['rows']:,} baris dicatat")
@@ -0,0 +1,284 @@
+"""Uji beban: banyak session bersamaan yang mengklik selector dashboard.
+
+Contoh:
+    python scripts/loadtest.py                          # 20, 50, 100 session
+    python scripts/loadtest.py --sessions 50 --json hasil.json
+    python scripts/loadtest.py --baseline hasil.json    # gagal bila melambat
+
+Menjalankan ``streamlit run scripts/app.py`` di port lokal (atau memakai
+server yang sudah jalan lewat --url), lalu tiap session membuka websocket
+seperti browser dan melakukan rerun dengan pilihan acak pada selectbox
+periode, kategori harga, genre dan slider rentang tahun. Widget di dalam
+fragment memicu rerun fragment saja, sama seperti di browser. AppTest tidak
+dipakai karena mengganti runtime global per run, jadi tidak bisa
+dijalankan bersamaan.
+
+Latensi = kirim rerun sampai ``script_finished``. Hasil per tingkat
+session: p50/p95/p99, throughput rerun per detik dan RSS proses server.
+
+Klien websocket memakai paket ``websockets`` (requirements.txt; server
+Streamlit versi lama berbasis tornado tidak membawanya). Status
+``FINISHED_FRAGMENT_RUN_SUCCESSFULLY`` untuk rerun fragment ada sejak
+``st.fragment``, jadi batas bawah streamlit>=1.37 app.py sudah cukup.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from profiling import current_rss
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+WIDGET_TYPES = ('selectbox', 'slider')
+PERCENTILES = (50, 95, 99)
+FINISHED_OK = (
+    ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY,
+    ForwardMsg.ScriptFinishedStatus.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+)
+
+
+class Session:
+    """Satu tab browser: state widget sendiri, satu rerun pada satu waktu."""
+
+    def __init__(self, url, rng, timeout):
+        self.url = url
+        self.rng = rng
+        self.timeout = timeout
+        self.widgets = {}  # id -> (jenis, proto elemen, fragment_id)
+        self.states = {}   # id -> WidgetState yang pernah diubah session ini
+        self.ws = None
+
+    async def __aenter__(self):
+        self.ws = await websockets.connect(
+            self.url.rstrip('/').replace('http', 'ws', 1) + '/_stcore/stream',
+            subprotocols=['streamlit'], max_size=None,
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    async def rerun(self, fragment_id=''):
+        """Satu rerun; kembalikan (detik, berhasil)."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = ''
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if not fragment_id:
+            self.widgets = {}
+
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        ok = True
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type == 'exception':
+                    ok = False
+                elif element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.id] = (element_type, widget, forward.delta.fragment_id)
+            elif kind == 'script_finished':
+                return time.perf_counter() - t0, ok and forward.script_finished in FINISHED_OK
+
+    async def interact(self):
+        """Ubah satu widget acak lalu rerun; kembalikan (label, detik, berhasil)."""
+        widget_id = self.rng.choice(sorted(self.widgets))
+        element_type, widget, fragment_id = self.widgets[widget_id]
+        state = self.states.setdefault(widget_id, WidgetState(id=widget_id))
+        if element_type == 'selectbox':
+            state.string_value = self.rng.choice(list(widget.options))
+        else:
+            low, high = sorted(self.rng.randint(int(widget.min), int(widget.max)) for _ in range(2))
+            state.double_array_value.data[:] = [low, high]
+        seconds, ok = await self.rerun(fragment_id)
+        return widget.label, seconds, ok
+
+
+async def run_session(url, seed, interactions, think_seconds, timeout, records):
+    rng = random.Random(seed)
+    try:
+        async with Session(url, rng, timeout) as session:
+            seconds, ok = await session.rerun()
+            records.append(('buka halaman', seconds, ok))
+            for _ in range(interactions):
+                await asyncio.sleep(rng.uniform(0, 2 * think_seconds))
+                if session.widgets:
+                    records.append(await session.interact())
+    except (OSError, asyncio.TimeoutError, websockets.WebSocketException):
+        records.append(('koneksi', float('nan'), False))
+
+
+async def run_level(url, sessions, interactions, think_seconds, timeout, seed, pid):
+    records, rss = [], []
+
+    async def sample_rss():
+        while True:
+            rss.append(current_rss(pid))
+            await asyncio.sleep(0.2)
+
+    sampler = asyncio.create_task(sample_rss()) if pid else None
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(url, seed * 1_000_003 + i, interactions, think_seconds, timeout, records)
+        for i in range(sessions)
+    ))
+    elapsed = time.perf_counter() - t0
+    if sampler is not None:
+        sampler.cancel()
+        rss.append(current_rss(pid))
+    return summarize(records, elapsed, sessions, rss)
+
+
+def summarize(records, elapsed, sessions, rss):
+    seconds = np.array([s for _, s, ok in records if ok])
+    result = {
+        'sessions': sessions,
+        'reruns': int(len(seconds)),
+        'errors': sum(1 for *_, ok in records if not ok),
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(seconds) / elapsed, 2) if elapsed else 0.0,
+        'rss_peak_mb': round(max(rss) / 2**20, 1) if rss else None,
+        'rss_end_mb': round(rss[-1] / 2**20, 1) if rss else None,
+    }
+    for p in PERCENTILES:
+        result[f'p{p}_ms'] = round(float(np.percentile(seconds, p)) * 1e3, 1) if len(seconds) else None
+    by_widget = {}
+    for label, s, ok in records:
+        if ok:
+            by_widget.setdefault(label, []).append(s)
+    result['p95_ms_by_action'] = {
+        label: round(float(np.percentile(values, 95)) * 1e3, 1) for label, values in sorted(by_widget.items())
+    }
+    errors = {}
+    for label, _, ok in records:
+        if not ok:
+            errors[label] = errors.get(label, 0) + 1
+    result['errors_by_action'] = errors
+    return result
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, timeout=120):
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_PATH, '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'server streamlit berhenti (kode {server.returncode})')
+        try:
+            with urllib.request.urlopen(url + '/_stcore/health', timeout=1):
+                return server, url
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f'server streamlit tidak siap dalam {timeout} detik')
+
+
+def compare(report, baseline, tolerance):
+    """Cetak perbandingan dengan baseline; kembalikan daftar regresi."""
+    regressions = []
+    print(f"\n== dibanding baseline (toleransi {tolerance:.0%}) ==")
+    for level, result in report['levels'].items():
+        base = baseline.get('levels', {}).get(level)
+        if base is None:
+            continue
+        for key, worse_if_higher in (('p95_ms', True), ('p99_ms', True), ('throughput', False), ('rss_peak_mb', True)):
+            old, new = base.get(key), result.get(key)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            worse = ratio > 1 + tolerance if worse_if_higher else ratio < 1 - tolerance
+            print(f"{level:>8} session {key:<12} {old:>10} -> {new:>10} ({ratio - 1:+.0%}){'  REGRESI' if worse else ''}")
+            if worse:
+                regressions.append((level, key))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[20, 50, 100])
+    parser.add_argument('--interactions', type=int, default=10, help='klik per session')
+    parser.add_argument('--think', type=float, default=0.5, help='rata-rata jeda antar klik (detik)')
+    parser.add_argument('--timeout', type=float, default=120, help='batas satu rerun (detik)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help='server yang sudah jalan (default: jalankan app.py sendiri)')
+    parser.add_argument('--pid', type=int, help='pid server --url untuk mengukur RSS')
+    parser.add_argument('--json', help='simpan hasil ke file JSON (baseline regresi)')
+    parser.add_argument('--baseline', help='file JSON hasil run sebelumnya untuk dibandingkan')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='selisih relatif yang masih diterima')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        server, url = start_server(free_port())
+        pid = server.pid
+    try:
+        # Satu session pemanasan: build dataset/cache tidak ikut diukur
+        t0 = time.perf_counter()
+        asyncio.run(run_session(url, -1, 0, 0, args.timeout, []))
+        report = {
+            'meta': {
+                'interactions': args.interactions, 'think': args.think, 'seed': args.seed,
+                'cpus': os.cpu_count(), 'ingest': os.environ.get('STEAM_DASHBOARD_INGEST', 'memory'),
+                'warmup_seconds': round(time.perf_counter() - t0, 3),
+            },
+            'levels': {},
+        }
+        for sessions in args.sessions:
+            report['levels'][str(sessions)] = asyncio.run(
+                run_level(url, sessions, args.interactions, args.think, args.timeout, args.seed, pid)
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"pemanasan {report['meta']['warmup_seconds']:.2f} detik")
+    print(f"{'session':>8} {'rerun':>7} {'error':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'rerun/dtk':>10} {'RSS MB':>8}")
+    for result in report['levels'].values():
+        cells = [f"{result[f'p{p}_ms']:>9}" for p in PERCENTILES]
+        print(f"{result['sessions']:>8} {result['reruns']:>7} {result['errors']:>6} {' '.join(cells)} "
+              f"{result['throughput']:>10} {result['rss_peak_mb'] or '-':>8}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
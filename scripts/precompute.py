@@ -0,0 +1,211 @@
+"""Bangun semua artefak dashboard di muka, paralel di beberapa proses.
+
+Contoh:
+    python scripts/precompute.py                  # data/steam.csv
+    python scripts/precompute.py data/steam.csv --workers 4 --force
+
+Dijalankan sekali di CI atau saat boot. Hasilnya (snapshot kolumnar, index
+genre/publisher, cube per tahun, bitmap, Top-K game per tahun, serta hasil
+query tiap periode preset) ditulis ke ``<steam>.artifacts/``; app.py hanya
+memuat artefak yang sudah jadi (mmap) bila manifest-nya cocok dengan versi
+steam.csv, dan baru membangun sendiri bila belum ada.
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bitmap import BitmapIndex
+from charts import PRICE_CATEGORIES
+from compute import PERIODS, SteamData
+from cube import YearCube, YearTopK
+from dimensions import DIMENSIONS, DimensionIndex
+from ingest import (
+    SNAPSHOT_VERSION, build_snapshot, dataset_version, freeze_frame, load_snapshot,
+    snapshot_is_fresh, snapshot_path_for, write_atomic,
+)
+from profiling import stage
+
+# Naikkan setiap kali isi/format artefak berubah
+ARTIFACTS_VERSION = 2
+
+# Argumen query yang dipakai app.py, dibangun untuk tiap periode preset
+TOP_GAMES_N = 5
+DENSITY_BINS = 40
+
+# Tahap berurutan; artefak dalam satu tahap saling bebas dan dibangun
+# paralel. Tahap berikutnya memuat hasil tahap sebelumnya dari disk
+PHASES = [
+    [('dimension', name) for name in DIMENSIONS] + [('top_k',)],
+    [('cube',), ('bitmaps',)],
+    [('queries', period) for period in PERIODS],
+]
+
+
+def artifacts_dir_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.artifacts'
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def artifacts_are_fresh(csv_path, manifest):
+    return (
+        manifest is not None
+        and manifest.get('version') == [SNAPSHOT_VERSION, ARTIFACTS_VERSION]
+        and manifest.get('sha256') == dataset_version(csv_path)
+    )
+
+
+def save_arrays(directory, name, arrays):
+    files = {}
+    for key, arr in arrays.items():
+        files[key] = f'{name}.{key}.npy'
+
+        def write(path, arr=arr):
+            with open(path, 'wb') as f:
+                np.save(f, np.require(arr, requirements='C'), allow_pickle=False)
+        write_atomic(os.path.join(directory, files[key]), write)
+    return files
+
+
+def load_arrays(directory, files):
+    # mmap_mode='r': array read-only yang menunjuk ke page cache bersama
+    return {key: np.load(os.path.join(directory, file), mmap_mode='r') for key, file in files.items()}
+
+
+def _load_parts(df, directory, artifacts):
+    dimensions = {
+        name: DimensionIndex.from_arrays(load_arrays(directory, artifacts[f'dimension:{name}'])).freeze()
+        for name in DIMENSIONS
+    }
+    cube = YearCube.from_arrays(load_arrays(directory, artifacts['cube'])).freeze()
+    bitmaps = BitmapIndex.from_arrays(load_arrays(directory, artifacts['bitmaps'])).freeze()
+    top_k = YearTopK.from_arrays(load_arrays(directory, artifacts['top_k'])).freeze()
+    return SteamData(freeze_frame(df), dimensions, cube, bitmaps, top_k)
+
+
+def build_artifact(csv_path, directory, job, artifacts):
+    """Bangun satu artefak di proses worker; kembalikan (nama, file, detik)."""
+    t0 = time.perf_counter()
+    name = ':'.join(job)
+    df = load_snapshot(snapshot_path_for(csv_path))
+    kind = job[0]
+    with stage(f'precompute[{name}]', rows=len(df)):
+        if kind == 'dimension':
+            index = DimensionIndex.from_series(df[job[1]], **DIMENSIONS[job[1]])
+            files = save_arrays(directory, f'dimension-{job[1]}', index.arrays())
+        elif kind == 'top_k':
+            top_k = YearTopK.build(df['release_year'].to_numpy(), df['positive_ratings'].to_numpy())
+            files = save_arrays(directory, 'top_k', top_k.arrays())
+        elif kind == 'cube':
+            dimensions = {
+                dim: DimensionIndex.from_arrays(load_arrays(directory, artifacts[f'dimension:{dim}']))
+                for dim in DIMENSIONS
+            }
+            files = save_arrays(directory, 'cube', YearCube.build(df, dimensions).arrays())
+        elif kind == 'bitmaps':
+            dimensions = {'genres': DimensionIndex.from_arrays(load_arrays(directory, artifacts['dimension:genres']))}
+            files = save_arrays(directory, 'bitmaps', BitmapIndex.build(df, dimensions).arrays())
+        elif kind == 'queries':
+            files = {'results': f'queries-{list(PERIODS).index(job[1])}.pkl'}
+            results = _period_queries(_load_parts(df, directory, artifacts), *PERIODS[job[1]][0])
+
+            def write(path):
+                with open(path, 'wb') as f:
+                    pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            write_atomic(os.path.join(directory, files['results']), write)
+        else:
+            raise ValueError(f'Artefak tidak dikenal: {name}')
+    return name, files, round(time.perf_counter() - t0, 3)
+
+
+def _period_queries(data, start, end):
+    version = data.range_version(start, end)
+    results = {
+        ('top_games', start, end, TOP_GAMES_N): data.top_games(start, end, TOP_GAMES_N),
+        ('owner_genres', start, end): data.owner_genres(start, end),
+        ('owner_points', start, end, 'Semua'): data.owner_points(start, end, 'Semua'),
+    }
+    for price_category in PRICE_CATEGORIES:
+        key = ('density', start, end, price_category, DENSITY_BINS)
+        results[key] = data.density(start, end, price_category, DENSITY_BINS)
+    return {key: (version, value) for key, value in results.items()}
+
+
+def precompute(csv_path, workers=None, force=False):
+    """Bangun snapshot lalu semua artefak; manifest ditulis paling akhir."""
+    directory = artifacts_dir_for(csv_path)
+    if not force and artifacts_are_fresh(csv_path, read_manifest(directory)):
+        return None
+    snapshot_path = snapshot_path_for(csv_path)
+    if force or not snapshot_is_fresh(csv_path, snapshot_path):
+        build_snapshot(csv_path, snapshot_path)
+    os.makedirs(directory, exist_ok=True)
+
+    artifacts, timings = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for phase in PHASES:
+            futures = [pool.submit(build_artifact, csv_path, directory, job, artifacts) for job in phase]
+            for future in futures:
+                name, files, seconds = future.result()
+                artifacts[name], timings[name] = files, seconds
+
+    manifest = {
+        'version': [SNAPSHOT_VERSION, ARTIFACTS_VERSION],
+        'sha256': dataset_version(csv_path),
+        'artifacts': artifacts,
+        'seconds': timings,
+    }
+
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    write_atomic(os.path.join(directory, 'manifest.json'), write)
+    return manifest
+
+
+def load_artifacts(csv_path, df):
+    """SteamData dari artefak precompute, atau None bila belum ada/kedaluwarsa.
+
+    ``df`` adalah frame snapshot (ingest.load_dataset) untuk versi yang sama.
+    """
+    directory = artifacts_dir_for(csv_path)
+    manifest = read_manifest(directory)
+    if not artifacts_are_fresh(csv_path, manifest):
+        return None
+    artifacts = manifest['artifacts']
+    with stage('load_artifacts', rows=len(df)):
+        data = _load_parts(df, directory, artifacts)
+        for name, files in artifacts.items():
+            if name.startswith('queries:'):
+                with open(os.path.join(directory, files['results']), 'rb') as f:
+                    data.precomputed.update(pickle.load(f))
+    return data
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bangun semua artefak dashboard di muka.')
+    parser.add_argument('csv', nargs='?', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'steam.csv'
+    ))
+    parser.add_argument('--workers', type=int, default=None, help='jumlah proses (default: jumlah core)')
+    parser.add_argument('--force', action='store_true', help='bangun ulang walau artefak masih cocok')
+    args = parser.parse_args()
+
+    manifest = precompute(args.csv, workers=args.workers, force=args.force)
+    if manifest is None:
+        print(f"Artefak di {artifacts_dir_for(args.csv)} masih cocok dengan {args.csv}")
+    else:
+        for name, seconds in manifest['seconds'].items():
+            print(f"{name}: {seconds:.3f} detik")
+        print(f"Artefak ditulis ke {artifacts_dir_for(args.csv)}")
@@ -0,0 +1,71 @@
+import contextvars
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Satu baris JSON per tahap, mis. untuk dikirim ke log agregator; mati
+# secara default, nyalakan dengan STEAM_DASHBOARD_STAGE_LOG=INFO
+logger = logging.getLogger('steam_dashboard.stages')
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(os.environ.get('STEAM_DASHBOARD_STAGE_LOG', 'WARNING').upper())
+    logger.propagate = False
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_recorder = contextvars.ContextVar('stage_recorder', default=None)
+
+
+def current_rss(pid='self'):
+    """RSS proses ``pid`` dalam byte (puncak RSS proses ini bila /proc tidak ada)."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        if resource is None or pid != 'self':
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class StageRecorder:
+    """Kumpulan catatan tahap untuk satu rerun (atau satu run benchmark)."""
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id
+        self.stages = []
+
+    def activate(self):
+        """Jadikan recorder ini tujuan semua ``stage()`` di thread ini."""
+        _recorder.set(self)
+        return self
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Ukur waktu, jumlah baris dan selisih RSS satu tahap bernama.
+
+    Record yang di-yield boleh diubah di dalam blok, mis. ``rec['rows'] = n``
+    bila jumlah baris baru diketahui setelah tahap berjalan.
+    """
+    record = {'stage': name, 'rows': rows}
+    rss_before = current_rss()
+    t0 = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = round(time.perf_counter() - t0, 6)
+        record['mem_delta_mb'] = round((current_rss() - rss_before) / 2**20, 3)
+        recorder = _recorder.get()
+        if recorder is not None:
+            record['run_id'] = recorder.run_id
+            recorder.stages.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({'ts': round(time.time(), 3), **record}))
@@ -0,0 +1,395 @@
+"""Ingest streaming: steam.csv dibaca per potongan dan dilipat ke agregat.
+
+Untuk CSV yang terlalu besar dimuat utuh (``STEAM_DASHBOARD_INGEST=stream``).
+Tabel penuh tidak pernah ada di memori; yang disimpan hanya agregat per
+bucket tahun (cube yang sama dengan mode biasa), kandidat Top N per bucket
+dan histogram yang cukup untuk menggambar ulang semua chart dashboard.
+Memori puncak = satu potongan + agregat, yang ukurannya tidak bergantung
+jumlah baris.
+
+Beda dengan mode biasa:
+- heatmap densitas memakai sumbu rasio tetap [0, 1] (RATIO_BINS bin);
+  sumbu harga tetap mengikuti min/max harga terpilih
+- chart owners selalu dalam bentuk level-of-detail (pita + Top N) bila
+  titiknya lebih dari POLAR_TOP_N
+"""
+import numpy as np
+import pandas as pd
+
+from charts import POLAR_TOP_N, PRICE_CATEGORIES, owner_bands
+from compute import SharedData
+from cube import YearCube
+from dimensions import DimensionIndex
+from ingest import iter_steam_csv
+from profiling import stage
+
+UNKNOWN_YEAR = -1
+RATIO_BINS = 40
+TOP_GAMES_K = 5
+
+
+class _Vocab:
+    """Nilai -> id global; bertambah saat potongan baru membawa nilai baru."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def map(self, values):
+        return np.array([self.ids.setdefault(v, len(self.ids)) for v in values], dtype=np.int64)
+
+    def values(self, dtype=object):
+        return np.array(list(self.ids), dtype=dtype)
+
+
+class _Grid:
+    """Array agregat yang diperbesar otomatis mengikuti indeks terbesar."""
+
+    def __init__(self, n_dims, dtype=np.int64):
+        self.values = np.zeros((0,) * n_dims, dtype=dtype)
+
+    def add(self, index, weights=1):
+        need = [int(ix.max()) + 1 if len(ix) else 0 for ix in index]
+        shape = self.values.shape
+        if any(n > s for n, s in zip(need, shape)):
+            grown = np.zeros([max(n, 2 * s) if n > s else s for n, s in zip(need, shape)], self.values.dtype)
+            grown[tuple(slice(0, s) for s in shape)] = self.values
+            self.values = grown
+        np.add.at(self.values, index, weights)
+
+    def trimmed(self, *shape):
+        values = np.zeros(shape, self.values.dtype)
+        have = tuple(slice(0, min(n, s)) for n, s in zip(shape, self.values.shape))
+        values[have] = self.values[have]
+        return values
+
+
+def _top_per_group(frame, group, sort_by, ascending, n):
+    frame = frame.sort_values([*group, *sort_by], ascending=[True] * len(group) + ascending, kind='stable')
+    return frame.groupby(group, sort=False).head(n)
+
+
+class StreamingAggregates:
+    """Pelipat potongan CSV; ``finish()`` menghasilkan StreamingData."""
+
+    def __init__(self):
+        self.n_rows = 0
+        self.n_entries = 0
+        self.years = _Vocab()
+        self.genres = _Vocab()
+        self.publishers = _Vocab()
+        self.prices = _Vocab()
+        self.owner_values = _Vocab()
+
+        self.rows = {name: _Grid(1, dtype) for name, dtype in (
+            ('count', np.int64), ('price_sum', np.float64), ('price_n', np.int64),
+            ('free_count', np.int64), ('owners_sum', np.float64), ('owners_n', np.int64),
+        )}
+        self.genre_counts = _Grid(2)
+        self.publisher_games = _Grid(2)
+        self.publisher_rating_sum = _Grid(2, np.float64)
+        self.density = _Grid(3)
+        self.owner_counts = _Grid(3)
+        self.owner_playtime = _Grid(3, np.float64)
+        self.owner_nan_counts = _Grid(2)
+        self.owner_nan_playtime = _Grid(2, np.float64)
+        self.top_games = None
+        self.top_owners = None
+
+    def add(self, chunk):
+        n = len(chunk)
+        year = chunk['release_year'].to_numpy(dtype=np.float64)
+        year = np.where(np.isnan(year), UNKNOWN_YEAR, year).astype(np.int64)
+        uniq, inverse = np.unique(year, return_inverse=True)
+        slot = self.years.map(uniq.tolist())[inverse]
+
+        price = chunk['price'].to_numpy(dtype=np.float64)
+        has_price = ~np.isnan(price)
+        positive = chunk['positive_ratings'].to_numpy(dtype=np.float64)
+        negative = chunk['negative_ratings'].to_numpy(dtype=np.float64)
+        owners = chunk['owners_mid'].to_numpy(dtype=np.float64)
+        has_owners = ~np.isnan(owners)
+        playtime = chunk['average_playtime'].to_numpy(dtype=np.float64)
+
+        self.rows['count'].add((slot,))
+        self.rows['price_sum'].add((slot[has_price],), price[has_price])
+        self.rows['price_n'].add((slot[has_price],))
+        self.rows['free_count'].add((slot[price == 0],))
+        self.rows['owners_sum'].add((slot[has_owners],), owners[has_owners])
+        self.rows['owners_n'].add((slot[has_owners],))
+
+        # Kode lokal index potongan -> id global
+        genre_index = DimensionIndex.from_series(chunk['genres'], exclude=('indie',))
+        genre_rows, genre_codes = genre_index.entries()
+        genre_ids = self.genres.map(genre_index.labels)[genre_codes]
+        self.genre_counts.add((slot[genre_rows], genre_ids))
+
+        publisher_index = DimensionIndex.from_series(chunk['publisher'])
+        publisher_rows, publisher_codes = publisher_index.entries()
+        publisher_ids = self.publishers.map(publisher_index.labels)[publisher_codes]
+        self.publisher_games.add((slot[publisher_rows], publisher_ids))
+        self.publisher_rating_sum.add((slot[publisher_rows], publisher_ids), positive[publisher_rows])
+
+        # Densitas: (slot, bin rasio, nilai harga); harga Steam bernilai diskret
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = positive / (positive + negative)
+        valid = ~np.isnan(ratio) & has_price
+        ratio_bin = np.minimum((ratio[valid] * RATIO_BINS).astype(np.int64), RATIO_BINS - 1)
+        price_values, price_inverse = np.unique(price[valid], return_inverse=True)
+        price_ids = self.prices.map(price_values.tolist())[price_inverse]
+        self.density.add((slot[valid], ratio_bin, price_ids))
+
+        # Owners per (slot, genre, nilai owners); NaN dipisah karena nilai
+        # pengisinya (rata-rata periode) baru diketahui saat query
+        # Entri tanpa playtime tidak digambar (sama dengan compute._owner_points)
+        timed = ~np.isnan(playtime[genre_rows])
+        owner_rows, owner_genre_ids = genre_rows[timed], genre_ids[timed]
+        entry_owners = owners[owner_rows]
+        entry_playtime = playtime[owner_rows]
+        known = ~np.isnan(entry_owners)
+        owner_values, owner_inverse = np.unique(entry_owners[known], return_inverse=True)
+        owner_ids = self.owner_values.map(owner_values.tolist())[owner_inverse]
+        index = (slot[owner_rows][known], owner_genre_ids[known], owner_ids)
+        self.owner_counts.add(index)
+        self.owner_playtime.add(index, entry_playtime[known])
+        index = (slot[owner_rows][~known], owner_genre_ids[~known])
+        self.owner_nan_counts.add(index)
+        self.owner_nan_playtime.add(index, entry_playtime[~known])
+
+        # Kandidat Top N: Top N tiap bucket pasti memuat Top N gabungan bucket
+        row = np.arange(self.n_rows, self.n_rows + n)
+        games = pd.DataFrame({
+            'slot': slot, 'row': row, 'name': chunk['name'].to_numpy(),
+            'positive_ratings': chunk['positive_ratings'].to_numpy(),
+            'negative_ratings': chunk['negative_ratings'].to_numpy(),
+        })
+        games = _top_per_group(games, ['slot'], ['positive_ratings', 'row'], [False, True], TOP_GAMES_K)
+        self.top_games = _top_per_group(
+            pd.concat([self.top_games, games]) if self.top_games is not None else games,
+            ['slot'], ['positive_ratings', 'row'], [False, True], TOP_GAMES_K,
+        )
+
+        entries = pd.DataFrame({
+            'slot': slot[owner_rows], 'genre': owner_genre_ids,
+            'entry': np.arange(self.n_entries, self.n_entries + len(owner_rows)),
+            'row': row[owner_rows],
+            'name': chunk['name'].to_numpy()[owner_rows],
+            'publisher': chunk['publisher'].to_numpy()[owner_rows],
+            'owners': entry_owners, 'average_playtime': entry_playtime,
+        })
+        # Owners kosong disimpan N pertama per grup: setelah diisi nilainya
+        # sama, jadi yang menang adalah yang paling awal
+        owners_top = pd.concat([
+            frame for frame in (
+                self.top_owners,
+                _top_per_group(entries[known], ['slot', 'genre'], ['owners', 'entry'], [False, True], POLAR_TOP_N),
+                _top_per_group(entries[~known], ['slot', 'genre'], ['entry'], [True], POLAR_TOP_N),
+            ) if frame is not None
+        ])
+        self.top_owners = pd.concat([
+            _top_per_group(owners_top[owners_top['owners'].notna()], ['slot', 'genre'], ['owners', 'entry'], [False, True], POLAR_TOP_N),
+            _top_per_group(owners_top[owners_top['owners'].isna()], ['slot', 'genre'], ['entry'], [True], POLAR_TOP_N),
+        ])
+
+        self.n_rows += n
+        self.n_entries += len(owner_rows)
+
+    def finish(self):
+        # Slot (urutan kemunculan) -> bucket cube: tahun rapat lalu 'tidak diketahui'
+        slot_years = self.years.values(np.int64)
+        known = slot_years[slot_years != UNKNOWN_YEAR]
+        first_year = int(known.min()) if len(known) else 0
+        n_years = int(known.max()) - first_year + 1 if len(known) else 0
+        bucket = np.where(slot_years == UNKNOWN_YEAR, n_years, slot_years - first_year)
+        n_buckets = n_years + 1
+
+        # Label diurutkan alfabetis seperti DimensionIndex mode biasa
+        def sorted_labels(vocab):
+            labels = vocab.values()
+            order = np.argsort(labels.astype(str), kind='stable')
+            new_id = np.empty(len(labels), dtype=np.int64)
+            new_id[order] = np.arange(len(labels))
+            return labels[order], new_id
+
+        genre_labels, genre_id = sorted_labels(self.genres)
+        publisher_labels, publisher_id = sorted_labels(self.publishers)
+        n_slots, n_genres, n_publishers = len(slot_years), len(genre_labels), len(publisher_labels)
+
+        def rebucket(grid, *shape, axis_ids=None):
+            values = grid.trimmed(n_slots, *shape)
+            out = np.zeros((n_buckets,) + values.shape[1:], values.dtype)
+            if axis_ids is not None:
+                reordered = np.zeros_like(values)
+                reordered[:, axis_ids] = values
+                values = reordered
+            out[bucket] = values
+            return out
+
+        full = {name: rebucket(grid) for name, grid in self.rows.items()}
+        full['genre_counts'] = rebucket(self.genre_counts, n_genres, axis_ids=genre_id)
+        full['publisher_games'] = rebucket(self.publisher_games, n_publishers, axis_ids=publisher_id)
+        full['publisher_rating_sum'] = rebucket(self.publisher_rating_sum, n_publishers, axis_ids=publisher_id)
+        cube = YearCube(
+            first_year,
+            {name: full[name][:n_years] for name in YearCube.FIELDS},
+            {name: full[name][n_years] for name in YearCube.FIELDS},
+        )
+
+        empty = np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64)
+        dimensions = {
+            'genres': DimensionIndex(genre_labels, *empty),
+            'publisher': DimensionIndex(publisher_labels, *empty),
+        }
+
+        n_prices, n_owner_values = len(self.prices), len(self.owner_values)
+        top_games = self.top_games.assign(slot=bucket[self.top_games['slot']]).rename(columns={'slot': 'bucket'})
+        top_owners = self.top_owners.assign(
+            slot=bucket[self.top_owners['slot']], genre=genre_id[self.top_owners['genre']]
+        ).rename(columns={'slot': 'bucket'})
+        return StreamingData(
+            dimensions=dimensions,
+            cube=cube,
+            owners_sum=full['owners_sum'],
+            owners_n=full['owners_n'],
+            price_values=self.prices.values(np.float64),
+            density=rebucket(self.density, RATIO_BINS, n_prices),
+            owner_values=self.owner_values.values(np.float64),
+            owner_counts=rebucket(self.owner_counts, n_genres, n_owner_values, axis_ids=genre_id),
+            owner_playtime=rebucket(self.owner_playtime, n_genres, n_owner_values, axis_ids=genre_id),
+            owner_nan_counts=rebucket(self.owner_nan_counts, n_genres, axis_ids=genre_id),
+            owner_nan_playtime=rebucket(self.owner_nan_playtime, n_genres, axis_ids=genre_id),
+            top_games=top_games.reset_index(drop=True),
+            top_owners=top_owners.reset_index(drop=True),
+        )
+
+
+class StreamingData(SharedData):
+    """Pengganti SteamData yang hanya berisi agregat hasil ingest streaming.
+
+    Atribut ``dimensions`` dan ``cube`` sama bentuknya dengan mode biasa
+    (index dimensi hanya berisi label), dan method query-nya sama dengan
+    ``compute.SteamData``.
+    """
+
+    def __init__(self, dimensions, cube, **aggregates):
+        super().__init__()
+        self.dimensions = dimensions
+        self.cube = cube
+        self.aggregates = aggregates
+        # Dibagi antar session seperti SteamData, jadi dikunci juga
+        for index in dimensions.values():
+            index.freeze()
+        cube.freeze()
+        for value in aggregates.values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+        self.fingerprint = self.compute_fingerprint()
+
+    @classmethod
+    def from_csv(cls, path, chunk_rows=200_000):
+        folder = StreamingAggregates()
+        with stage('stream_ingest') as rec:
+            for chunk in iter_steam_csv(path, chunk_rows):
+                with stage('stream_chunk', rows=len(chunk)):
+                    folder.add(chunk)
+            rec['rows'] = folder.n_rows
+        with stage('stream_finish', rows=folder.n_rows):
+            return folder.finish()
+
+    def _arrays(self):
+        for index in self.dimensions.values():
+            yield index.labels
+        for group in (self.cube.per_year, self.cube.unknown, self.cube.cum):
+            for name in self.cube.FIELDS:
+                yield np.asarray(group[name])
+        for value in self.aggregates.values():
+            if isinstance(value, pd.DataFrame):
+                yield from (value[col].to_numpy() for col in value)
+            else:
+                yield value
+
+    def _select(self, name, start, end):
+        return self.aggregates[name][self.cube.buckets(start, end)].sum(axis=0)
+
+    def top_games(self, start, end, n=5):
+        if n > TOP_GAMES_K:
+            raise ValueError(f"mode streaming hanya menyimpan Top {TOP_GAMES_K} game per tahun")
+        games = self.aggregates['top_games']
+        games = games[games['bucket'].isin(self.cube.buckets(start, end))]
+        games = games.sort_values(['positive_ratings', 'row'], ascending=[False, True], kind='stable').head(n)
+        return games.set_index('row').rename_axis(None)[['name', 'positive_ratings', 'negative_ratings']]
+
+    def density(self, start, end, price_category, nbins=40):
+        counts = self._select('density', start, end)
+        prices = self.aggregates['price_values']
+        keep = PRICE_CATEGORIES[price_category](prices) & (counts.sum(axis=0) > 0)
+        prices, counts = prices[keep], counts[:, keep]
+        if len(prices) == 0:
+            return np.zeros(0), np.zeros(0), np.zeros((0, 0), dtype=np.int64)
+        # Sumbu harga dihitung seperti np.histogram2d dari nilai terpilih
+        _, y_edges = np.histogram(prices, bins=nbins)
+        z = np.stack([np.histogram(prices, bins=y_edges, weights=row)[0] for row in counts], axis=1)
+        x_edges = np.linspace(0, 1, RATIO_BINS + 1)
+        return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, z.astype(np.int64)
+
+    def owner_genres(self, start, end):
+        counts = self.cube.window(start, end, include_unknown=start is None and end is None).genre_counts
+        return self.dimensions['genres'].labels[counts > 0].tolist()
+
+    def owner_points(self, start, end, genre='Semua'):
+        with stage('owner_points') as rec:
+            result = self._owner_points(start, end, genre)
+            rec['rows'] = result[3]
+        return result
+
+    def _owner_points(self, start, end, genre):
+        labels = self.dimensions['genres'].labels
+        owners_n = self._select('owners_n', start, end)
+        fill = self._select('owners_sum', start, end) / owners_n if owners_n else np.nan
+
+        counts = self._select('owner_counts', start, end)
+        playtime = self._select('owner_playtime', start, end)
+        nan_counts = self._select('owner_nan_counts', start, end)
+        nan_playtime = self._select('owner_nan_playtime', start, end)
+        if np.isnan(fill):
+            nan_counts = np.zeros_like(nan_counts)
+        if genre != 'Semua':
+            only = np.arange(len(labels)) == self.dimensions['genres'].code_of(genre)
+            counts, playtime = counts * only[:, None], playtime * only[:, None]
+            nan_counts, nan_playtime = nan_counts * only, nan_playtime * only
+
+        # Satu elemen per (genre, nilai owners) berbobot jumlah titiknya
+        codes, value_ids = np.nonzero(counts)
+        nan_codes = np.flatnonzero(nan_counts)
+        codes = np.concatenate([codes, nan_codes])
+        owners = np.concatenate([self.aggregates['owner_values'][value_ids], np.full(len(nan_codes), fill)])
+        weights = np.concatenate([counts[counts > 0], nan_counts[nan_codes]])
+        playtime_sum = np.concatenate([playtime[counts > 0], nan_playtime[nan_codes]])
+        n_points = int(weights.sum())
+
+        present = np.unique(codes)
+        genre_map = {g: i * 360 / len(present) for i, g in enumerate(labels[present])}
+        theta = np.zeros(len(labels))
+        theta[present] = list(genre_map.values())
+
+        top = self.aggregates['top_owners']
+        top = top[top['bucket'].isin(self.cube.buckets(start, end))]
+        if genre != 'Semua':
+            top = top[top['genre'] == self.dimensions['genres'].code_of(genre)]
+        top = top.assign(owners=top['owners'].fillna(fill)).dropna(subset=['owners'])
+        top = top.sort_values(['owners', 'entry'], ascending=[False, True], kind='stable').head(POLAR_TOP_N)
+
+        if n_points > POLAR_TOP_N:
+            df_owner_bins = owner_bands(codes, owners, playtime_sum, labels, counts=weights)
+            df_owner_bins['theta'] = df_owner_bins['genres'].map(genre_map)
+        else:
+            df_owner_bins = None
+
+        df_owner = top.set_index('row').rename_axis(None)[['name', 'publisher', 'owners', 'average_playtime']]
+        df_owner['genres'] = labels[top['genre'].to_numpy()]
+        df_owner['theta'] = theta[top['genre'].to_numpy()]
+        df_owner['owners_scaled'] = df_owner['owners']
+        df_owner['marker_size'] = np.clip(df_owner['average_playtime'] / 60, 5, 20)
+        return df_owner, df_owner_bins, genre_map, n_points
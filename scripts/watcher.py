@@ -0,0 +1,173 @@
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from compute import SteamData
+from duckdb_backend import DuckDBData
+from ingest import dataset_version, load_dataset, load_delta, read_deltas
+from precompute import load_artifacts
+from profiling import stage
+from streaming import StreamingData
+
+logger = logging.getLogger('steam_dashboard.watcher')
+
+# Satu versi data yang siap dipakai; tidak pernah diubah setelah dibuat,
+# versi baru selalu objek baru
+Dataset = namedtuple('Dataset', 'version source data deltas')
+
+
+def source_stat(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _memory_data(path, chunk_rows):
+    # load_dataset memakai snapshot kolumnar (mmap) dan membangunnya ulang
+    # bila steam.csv berubah; artefak precompute.py dipakai bila cocok
+    df = load_dataset(path)
+    data = load_artifacts(path, df)
+    return data if data is not None else SteamData.from_frame(df)
+
+
+# Backend query per mode ingest; semuanya punya method query yang sama.
+# 'memory' (pandas/numpy) adalah referensi, satu-satunya yang mendukung
+# delta, artefak precompute dan mode perkiraan
+BACKENDS = {
+    'memory': _memory_data,
+    'stream': lambda path, chunk_rows: StreamingData.from_csv(path, chunk_rows=chunk_rows),
+    'duckdb': lambda path, chunk_rows: DuckDBData.from_csv(path),
+}
+
+
+def build_data(path, mode='memory', chunk_rows=200_000):
+    """Semua turunan steam.csv untuk ``mode`` (kunci ``BACKENDS``)."""
+    if mode not in BACKENDS:
+        raise ValueError(f"Mode ingest tidak dikenal: {mode!r} (pilihan: {', '.join(BACKENDS)})")
+    return BACKENDS[mode](path, chunk_rows)
+
+
+class DatasetWatcher:
+    """Dataset terkini per proses server, diperbarui di thread latar.
+
+    ``current()`` hanya membaca satu referensi, jadi tidak pernah menunggu
+    build. Thread latar memantau steam.csv: bila berubah (dan ukurannya
+    sudah stabil satu interval, supaya file yang masih disalin tidak ikut
+    diparse), semua turunan dibangun ulang lalu referensinya ditukar
+    sekaligus. Delta baru di manifest diterapkan dengan cara yang sama.
+    Rerun yang sudah memegang versi lama tetap memakainya sampai selesai.
+    """
+
+    def __init__(self, path, mode='memory', chunk_rows=200_000, poll_seconds=5.0):
+        self.path = path
+        self.mode = mode
+        self.chunk_rows = chunk_rows
+        self.poll_seconds = poll_seconds
+        self.swaps = 0
+        self.last_swap = None
+        self.last_build_seconds = None
+        self.last_delta_seconds = None
+        self.last_error = None
+        self._dataset = None
+        self._pending = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def load(self):
+        """Muat versi terkini sekali (blocking), tanpa thread pemantau.
+
+        Untuk skrip offline seperti export.py yang hanya butuh satu versi.
+        """
+        self._dataset = self._load(source_stat(self.path))
+        return self._dataset
+
+    def start(self):
+        """Muat versi pertama (blocking) lalu jalankan thread pemantau."""
+        self.load()
+        self._thread = threading.Thread(target=self._run, name='steam-dataset-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def current(self):
+        return self._dataset
+
+    def _swap(self, dataset, kind):
+        self._dataset = dataset  # satu assignment: pembaca melihat versi lama atau baru
+        self.swaps += 1
+        self.last_swap = kind
+
+    def _load(self, source):
+        t0 = time.perf_counter()
+        with stage('watcher_build'):
+            data = build_data(self.path, self.mode, self.chunk_rows)
+            dataset = self._apply_deltas(Dataset(dataset_version(self.path), source, data, ()))
+        self.last_build_seconds = round(time.perf_counter() - t0, 3)
+        return dataset
+
+    def _apply_deltas(self, dataset):
+        if self.mode != 'memory':
+            return dataset
+        deltas = read_deltas(self.path, version=dataset.version)
+        delta_ids = tuple(entry['sha256'] for entry in deltas)
+        if delta_ids[:len(dataset.deltas)] != dataset.deltas:
+            # Manifest ditulis ulang (bukan ditambah): mulai lagi dari dasar
+            return None
+        data = dataset.data
+        for entry in deltas[len(dataset.deltas):]:
+            data = data.apply_delta(load_delta(entry), entry['sha256'])
+        return dataset._replace(data=data, deltas=delta_ids)
+
+    def poll(self):
+        """Satu pemeriksaan; True bila versi baru dipasang."""
+        dataset = self._dataset
+        source = source_stat(self.path)
+        if source != dataset.source:
+            if source != self._pending:
+                self._pending = source  # tunggu satu interval lagi
+                return False
+            self._pending = None
+            self._swap(self._load(source), 'build')
+            return True
+        t0 = time.perf_counter()
+        updated = self._apply_deltas(dataset)
+        if updated is None:
+            self._swap(self._load(source), 'build')
+            return True
+        if updated.deltas != dataset.deltas:
+            # Hanya delta yang diterapkan: waktu build penuh terakhir tetap
+            self.last_delta_seconds = round(time.perf_counter() - t0, 3)
+            self._swap(updated, 'delta')
+            return True
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                if self.poll():
+                    seconds = self.last_delta_seconds if self.last_swap == 'delta' else self.last_build_seconds
+                    logger.info(
+                        'dataset %s dipasang (%s, %s delta, %s detik)',
+                        self._dataset.version[:12], self.last_swap, len(self._dataset.deltas), seconds,
+                    )
+                self.last_error = None
+            except Exception as exc:  # versi lama tetap dipakai, coba lagi interval berikutnya
+                error = f'{type(exc).__name__}: {exc}'
+                if error != self.last_error:  # satu log per jenis kegagalan, bukan per interval
+                    logger.exception('gagal memperbarui dataset')
+                self.last_error = error
+
+    def stats(self):
+        dataset = self._dataset
+        return {
+            'version': dataset.version,
+            'deltas': len(dataset.deltas),
+            'swaps': self.swaps,
+            'last_swap': self.last_swap,
+            'last_build_seconds': self.last_build_seconds,
+            'last_delta_seconds': self.last_delta_seconds,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from benchmark import synthetic_steam  # noqa: E402
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Tulis frame berskema steam.csv ke tmp_path; kembalikan path-nya."""
+    def write(df, name='steam.csv'):
+        path = str(tmp_path / name)
+        df.to_csv(path, index=False, date_format='%Y-%m-%d')
+        return path
+    return write
+
+
+@pytest.fixture
+def games():
+    """Frame sintetis berskema steam.csv (lihat benchmark.synthetic_steam)."""
+    return synthetic_steam
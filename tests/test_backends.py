@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import compute
+import ingest
+from charts import POLAR_TOP_N, PRICE_CATEGORIES
+from streaming import StreamingData
+
+RANGES = [(None, None), (2014, None), (2010, 2019), (None, 2009), (2005, 2007), (2030, 2031)]
+GENRES = ['Semua', 'Action', 'RPG', "Kids' Games", 'Unknown', 'Tidak Ada']
+
+
+def edge_rows():
+    """Baris yang rawan beda antar backend (ditambahkan ke frame sintetis)."""
+    rows = pd.DataFrame({
+        'genres': [None, 'Indie', 'Indie;Action', "Kids' Games;Casual", ' RPG ; ;Action ', 'Unknown', 'RPG'],
+        'owners': ['20000-50000', '50000+', None, '50000+', '0-20000', 'rusak', '100000-200000'],
+        'release_date': ['2015-01-01', None, 'bogus', '2016-07-07', '2012-02-02', '2018-09-09', 'bogus'],
+        'publisher': ['Publisher 1', None, "O'Brien Games", 'Publisher 2', 'Publisher 1;Publisher 3', None, ''],
+        'price': [0.0, 9.99, 19.99, 149.99, 4.99, 0.0, 59.99],
+    })
+    rows['positive_ratings'] = [10, 0, 2_000_000, 5, 300, 0, 70]
+    rows['negative_ratings'] = [1, 0, 10, 5, 30, 0, 7]
+    rows['average_playtime'] = [100, 0, 5_000, 60, 90, 30, 1_000]
+    return rows
+
+
+@pytest.fixture(scope='module')
+def steam_csv(tmp_path_factory):
+    from benchmark import synthetic_steam
+
+    base = synthetic_steam(5_000, seed=7)
+    edges = edge_rows()
+    full = base.iloc[:len(edges)].copy().reset_index(drop=True)
+    for column in edges:
+        full[column] = edges[column]
+    full['appid'] = 50_000_000 + np.arange(len(full))
+    full['name'] = [f'Edge {i}' for i in range(len(full))]
+    # Baris edge di tengah supaya jatuh di potongan streaming yang berbeda
+    df = pd.concat([base.iloc[:2_500], full.iloc[:4], base.iloc[2_500:], full.iloc[4:]], ignore_index=True)
+    path = str(tmp_path_factory.mktemp('backends') / 'steam.csv')
+    df.to_csv(path, index=False, date_format='%Y-%m-%d')
+    return path
+
+
+@pytest.fixture(scope='module')
+def reference(steam_csv):
+    return compute.SteamData.from_frame(ingest.read_steam_csv(steam_csv))
+
+
+def assert_cube_equal(expected, actual):
+    for name in ('genres', 'publisher'):
+        assert list(expected.dimensions[name].labels) == list(actual.dimensions[name].labels)
+    assert (expected.cube.first_year, expected.cube.n_years) == (actual.cube.first_year, actual.cube.n_years)
+    for name in expected.cube.FIELDS:
+        np.testing.assert_allclose(expected.cube.per_year[name], actual.cube.per_year[name], err_msg=name)
+        np.testing.assert_allclose(expected.cube.unknown[name], actual.cube.unknown[name], err_msg=name)
+
+
+def assert_windows_equal(expected, actual, start, end):
+    include_unknown = start is None and end is None
+    w1 = expected.cube.window(start, end, include_unknown)
+    w2 = actual.cube.window(start, end, include_unknown)
+    k1, k2 = compute.kpis(expected.dimensions, w1), compute.kpis(actual.dimensions, w2)
+    assert k1.keys() == k2.keys()
+    for key in k1:
+        if isinstance(k1[key], float):
+            assert np.isclose(k1[key], k2[key], equal_nan=True), key
+        else:
+            assert k1[key] == k2[key], key
+    for query in (compute.top_genres, compute.top_publishers):
+        pd.testing.assert_frame_equal(query(expected.dimensions, w1), query(actual.dimensions, w2))
+    pd.testing.assert_frame_equal(compute.price_distribution(w1), compute.price_distribution(w2))
+    pd.testing.assert_frame_equal(
+        expected.top_games(start, end), actual.top_games(start, end),
+        check_dtype=False, check_index_type=False,
+    )
+    assert expected.owner_genres(start, end) == actual.owner_genres(start, end)
+
+
+def comparable(frame):
+    # Kolom kategori (pandas) vs teks (agregat/SQL): bandingkan sebagai teks;
+    # urutan titik tidak mempengaruhi plot, jadi diurutkan per (baris, genre)
+    frame = frame.astype({'publisher': object}).fillna({'publisher': ''}).astype({'publisher': str})
+    return frame.rename_axis('row').sort_values(['row', 'genres'], kind='stable')
+
+
+@pytest.fixture(scope='module')
+def streaming_data(steam_csv):
+    # Potongan jauh lebih kecil dari file: agregat benar-benar dilipat
+    return StreamingData.from_csv(steam_csv, chunk_rows=700)
+
+
+def test_streaming_cube_matches_memory(reference, streaming_data):
+    assert_cube_equal(reference, streaming_data)
+
+
+@pytest.mark.parametrize('start,end', RANGES)
+def test_streaming_queries_match_memory(reference, streaming_data, start, end):
+    assert_windows_equal(reference, streaming_data, start, end)
+
+    # Streaming memakai sumbu rasio tetap [0, 1] (lihat docstring
+    # streaming.py); sumbu harga dan jumlah per baris harga harus sama
+    for price_category in PRICE_CATEGORIES:
+        _, y1, z1 = reference.density(start, end, price_category)
+        _, y2, z2 = streaming_data.density(start, end, price_category)
+        np.testing.assert_allclose(y1, y2, rtol=1e-6)
+        np.testing.assert_array_equal(z1.sum(axis=1), z2.sum(axis=1))
+
+    for genre in GENRES:
+        o1, b1, m1, n1 = reference.owner_points(start, end, genre)
+        o2, b2, m2, n2 = streaming_data.owner_points(start, end, genre)
+        assert (m1, n1) == (m2, n2)
+        if b1 is not None:
+            columns = ['genres', 'band', 'owners', 'average_playtime', 'games', 'marker_size', 'theta']
+            pd.testing.assert_frame_equal(
+                b1.sort_values(['genres', 'band']).reset_index(drop=True)[columns],
+                b2.sort_values(['genres', 'band']).reset_index(drop=True)[columns],
+                check_dtype=False, rtol=1e-6,
+            )
+        elif n1 > POLAR_TOP_N:
+            # Streaming sudah meringkas di atas POLAR_TOP_N titik; titik
+            # detailnya adalah Top N owners dari semua titik mode biasa
+            o1 = o1.sort_values('owners', ascending=False, kind='stable').head(POLAR_TOP_N)
+        pd.testing.assert_frame_equal(
+            comparable(o1), comparable(o2), check_dtype=False, check_index_type=False, rtol=1e-6,
+        )
+
+
+@pytest.fixture(scope='module')
+def duckdb_data(steam_csv):
+    pytest.importorskip('duckdb')
+    from duckdb_backend import DuckDBData
+
+    return DuckDBData.from_csv(steam_csv)
+
+
+def test_duckdb_cube_matches_memory(reference, duckdb_data):
+    assert_cube_equal(reference, duckdb_data)
+
+
+@pytest.mark.parametrize('start,end', RANGES)
+def test_duckdb_queries_match_memory(reference, duckdb_data, start, end):
+    assert_windows_equal(reference, duckdb_data, start, end)
+
+    # SQL menghitung histogram dan titik owners yang sama persis
+    for price_category in PRICE_CATEGORIES:
+        for u, v in zip(reference.density(start, end, price_category), duckdb_data.density(start, end, price_category)):
+            np.testing.assert_allclose(u, v)
+
+    for genre in GENRES:
+        o1, b1, m1, n1 = reference.owner_points(start, end, genre)
+        o2, b2, m2, n2 = duckdb_data.owner_points(start, end, genre)
+        assert (m1, n1) == (m2, n2)
+        assert (b1 is None) == (b2 is None)
+        if b1 is not None:
+            pd.testing.assert_frame_equal(
+                b1.sort_values(['genres', 'band']).reset_index(drop=True),
+                b2.sort_values(['genres', 'band']).reset_index(drop=True),
+                check_dtype=False, rtol=1e-6,
+            )
+        pd.testing.assert_frame_equal(
+            comparable(o1), comparable(o2), check_dtype=False, check_index_type=False, rtol=1e-6,
+        )
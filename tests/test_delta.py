@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import compute
+import ingest
+from bitmap import BitmapIndex, _concat_bits
+from charts import PRICE_CATEGORIES
+from cube import YearCube
+
+RANGES = [(None, None), (2014, None), (2010, 2019), (None, 2009), (2021, 2021)]
+
+
+def make_deltas(base, n_deltas=3, seed=1):
+    """Delta berisi game yang diperbarui (appid lama) dan game baru.
+
+    Jumlah baris sengaja bukan kelipatan 8 supaya bitset disambung di
+    tengah byte; ada genre baru, tahun tak diketahui dan harga berpindah
+    kategori.
+    """
+    rng = np.random.default_rng(seed)
+    deltas, merged = [], base
+    for k in range(n_deltas):
+        updated = merged.sample(37, random_state=k).copy()
+        updated['price'] = rng.choice([0, 4.99, 59.99, 149.99], len(updated))
+        updated['genres'] = rng.choice(['Action;Brand New Genre', 'RPG', 'Indie;Casual', None], len(updated))
+        updated['publisher'] = rng.choice([f'Delta Pub {k}', 'Publisher 3', None], len(updated))
+        updated['release_date'] = rng.choice(['2021-05-01', '1990-01-01', 'bogus', '2015-02-02'], len(updated))
+        updated['positive_ratings'] = rng.integers(0, 5_000_000, len(updated))
+        added = merged.sample(13 + k, random_state=10 + k).copy()
+        added['appid'] = 10_000_000 + k * 1000 + np.arange(len(added))
+        delta = pd.concat([updated, added])
+        deltas.append(delta)
+        merged = pd.concat([merged[~merged['appid'].isin(delta['appid'])], delta], ignore_index=True)
+    return deltas, merged
+
+
+@pytest.fixture
+def applied_and_fresh(games, write_csv):
+    base = games(203, seed=0)
+    deltas, merged = make_deltas(base)
+    base_csv = write_csv(base)
+    data = compute.SteamData.from_frame(ingest.load_dataset(base_csv))
+    for k, delta in enumerate(deltas):
+        entry = ingest.add_delta(base_csv, write_csv(delta, f'delta{k}.csv'))
+        data = data.apply_delta(ingest.load_delta(entry), entry['sha256'])
+    fresh = compute.SteamData.from_frame(ingest.read_steam_csv(write_csv(merged, 'merged.csv')))
+    return data, fresh
+
+
+def test_cube_matches_rebuild(applied_and_fresh):
+    data, fresh = applied_and_fresh
+    c1, c2 = data.cube, fresh.cube
+    assert (c1.first_year, c1.n_years) == (c2.first_year, c2.n_years)
+    for name in ('count', 'price_sum', 'price_n', 'free_count'):
+        np.testing.assert_allclose(c1.per_year[name], c2.per_year[name])
+        np.testing.assert_allclose(c1.unknown[name], c2.unknown[name])
+    for dim in ('genres', 'publisher'):
+        # Label yang hilang setelah delta tetap ada di index lama dengan nilai 0
+        l1, l2 = data.dimensions[dim].labels, fresh.dimensions[dim].labels
+        pos = np.searchsorted(l1, l2)
+        assert (l1[pos] == l2).all()
+        gone = np.setdiff1d(np.arange(len(l1)), pos)
+        for field, field_dim in YearCube.LABEL_FIELDS.items():
+            if field_dim != dim:
+                continue
+            np.testing.assert_allclose(c1.per_year[field][:, pos], c2.per_year[field])
+            np.testing.assert_allclose(c1.unknown[field][pos], c2.unknown[field])
+            assert c1.per_year[field][:, gone].sum() == 0
+
+
+@pytest.mark.parametrize('start,end', RANGES)
+def test_queries_match_rebuild(applied_and_fresh, start, end):
+    data, fresh = applied_and_fresh
+    include_unknown = start is None and end is None
+    w1 = data.cube.window(start, end, include_unknown)
+    w2 = fresh.cube.window(start, end, include_unknown)
+    k1, k2 = compute.kpis(data.dimensions, w1), compute.kpis(fresh.dimensions, w2)
+    assert k1.keys() == k2.keys()
+    for key in k1:
+        if isinstance(k1[key], float):
+            assert np.isclose(k1[key], k2[key], equal_nan=True), key
+        else:
+            assert k1[key] == k2[key], key
+    pd.testing.assert_frame_equal(
+        data.top_games(start, end).reset_index(drop=True), fresh.top_games(start, end).reset_index(drop=True),
+    )
+    assert data.owner_genres(start, end) == fresh.owner_genres(start, end)
+    for price_category in PRICE_CATEGORIES:
+        for u, v in zip(data.density(start, end, price_category), fresh.density(start, end, price_category)):
+            np.testing.assert_allclose(u, v)
+
+
+def test_bitmaps_match_rebuild(applied_and_fresh):
+    data, fresh = applied_and_fresh
+    b1, b2 = data.bitmaps, fresh.bitmaps
+
+    # Tombstone: baris lama yang digantikan delta tidak lagi hidup
+    alive = b1.mask()
+    assert b1.n_rows == len(data.df) > b2.n_rows
+    assert alive.sum() == b2.n_rows
+    appids = data.df['appid'].to_numpy()
+    assert len(np.unique(appids[alive])) == alive.sum()
+
+    # Bandingkan per appid: baris hidup bitmap delta vs bitmap hasil build ulang
+    order1 = np.argsort(appids[alive])
+    order2 = np.argsort(fresh.df['appid'].to_numpy())
+
+    def rows(bitmap, bits, keep, order):
+        return np.unpackbits(bits, count=bitmap.n_rows).view(bool)[keep][order]
+
+    everything = np.ones(b2.n_rows, dtype=bool)
+    for group in BitmapIndex.GROUPS:
+        g1, g2 = getattr(b1, group), getattr(b2, group)
+        assert set(g2) <= set(g1)
+        for key, bits in g1.items():
+            expected = rows(b2, g2[key], everything, order2) if key in g2 else np.zeros(b2.n_rows, bool)
+            np.testing.assert_array_equal(rows(b1, bits, alive, order1), expected, err_msg=f'{group}[{key}]')
+
+    for start, end in RANGES:
+        for price_category in PRICE_CATEGORIES:
+            for genres in (None, 'Action', 'Brand New Genre', ['RPG', 'Casual']):
+                assert b1.count(start, end, prices=price_category, genres=genres) == \
+                    b2.count(start, end, prices=price_category, genres=genres)
+
+
+@pytest.mark.parametrize('n_left', [0, 1, 7, 8, 13, 16])
+@pytest.mark.parametrize('n_right', [0, 5, 8, 11])
+def test_concat_bits(n_left, n_right):
+    rng = np.random.default_rng(n_left * 100 + n_right)
+    left, right = rng.random(n_left) < 0.5, rng.random(n_right) < 0.5
+    bits = _concat_bits(np.packbits(left), n_left, np.packbits(right), n_right)
+    np.testing.assert_array_equal(bits, np.packbits(np.concatenate([left, right])))
+
+
+def test_fingerprint_is_eager_and_tracks_deltas(applied_and_fresh):
+    data, fresh = applied_and_fresh
+    assert len(data.segments) == 4
+    assert data.fingerprint == data.compute_fingerprint()
+    assert data.is_unchanged() and fresh.is_unchanged()
+    assert data.fingerprint != fresh.fingerprint
+
+
+def test_versions_and_precomputed_are_per_instance(games, write_csv, applied_and_fresh):
+    data, fresh = applied_and_fresh
+    other_csv = write_csv(games(50, seed=9), 'other.csv')
+    other = compute.SteamData.from_frame(ingest.read_steam_csv(other_csv))
+    # Delta hanya mengubah versi objek barunya, bukan objek lain
+    assert data.bucket_versions and not fresh.bucket_versions and not other.bucket_versions
+    assert fresh.bucket_versions is not other.bucket_versions
+    assert fresh.precomputed is not other.precomputed
+    fresh.precomputed[('top_games', None, None, 5)] = (fresh.range_version(), None)
+    assert not other.precomputed
+
+    # Hasil precompute ikut ke objek hasil delta, versi bucket disalin
+    entry = ingest.add_delta(other_csv, write_csv(games(3, seed=10), 'other_delta.csv'))
+    updated = other.apply_delta(ingest.load_delta(entry), entry['sha256'])
+    assert updated.precomputed is other.precomputed
+    assert updated.bucket_versions and not other.bucket_versions
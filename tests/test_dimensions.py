@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+import dimensions
+import ingest
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_parallel_build_matches_serial(games, write_csv, monkeypatch, workers):
+    df = games(1_500, seed=6)
+    # Nilai kosong, spasi dan token ganda ikut dibagi ke potongan worker
+    df.loc[::97, 'genres'] = None
+    df.loc[::89, 'genres'] = ' Indie ; ;Action;Indie '
+    df.loc[::83, 'publisher'] = "O'Brien Games; Publisher 1"
+    df = ingest.read_steam_csv(write_csv(df))
+
+    serial = dimensions.build_dimensions(df, workers=1)
+    # Frame kecil: turunkan ambang supaya pool proses benar-benar dipakai
+    monkeypatch.setattr(dimensions, 'PARALLEL_MIN_VALUES', 1)
+    parallel = dimensions.build_dimensions(df, workers=workers)
+
+    assert serial.keys() == parallel.keys()
+    for name in serial:
+        np.testing.assert_array_equal(serial[name].labels, parallel[name].labels, err_msg=name)
+        np.testing.assert_array_equal(serial[name].codes, parallel[name].codes, err_msg=name)
+        np.testing.assert_array_equal(serial[name].offsets, parallel[name].offsets, err_msg=name)
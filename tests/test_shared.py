@@ -0,0 +1,154 @@
+import os
+
+import numpy as np
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import ingest
+from compute import PERIODS, SteamData
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts', 'app.py')
+CUSTOM_PERIOD = 'Rentang Tahun (Kustom)'
+
+
+@pytest.fixture
+def steam_data(games, write_csv):
+    return SteamData.from_frame(ingest.read_steam_csv(write_csv(games(300, seed=2))))
+
+
+def write_frame(df):
+    df['positive_ratings'] += 1
+
+
+def write_loc(df):
+    df.loc[0, 'price'] = 1.0
+
+
+def write_loc_column(df):
+    df.loc[:, 'price'] = 1.0
+
+
+def write_iloc(df):
+    df.iloc[0, 0] = 1
+
+
+def write_at(df):
+    df.at[0, 'name'] = 'Game baru'
+
+
+def add_column(df):
+    df['baru'] = 1
+
+
+def drop_column(df):
+    del df['price']
+
+
+def fill_inplace(df):
+    df.fillna({'average_playtime': 0}, inplace=True)
+
+
+def where_inplace(df):
+    df.where(df['price'] > 0, inplace=True)
+
+
+def rename_columns(df):
+    df.columns = [f'c{i}' for i in range(df.shape[1])]
+
+
+def write_numpy(df):
+    df['price'].to_numpy()[0] = 1.0
+
+
+def write_codes(df):
+    df['genres'].cat.codes.to_numpy()[0] = 0
+
+
+@pytest.mark.parametrize('write', [
+    write_frame, write_loc, write_loc_column, write_iloc, write_at, add_column, drop_column,
+    fill_inplace, where_inplace, rename_columns, write_numpy, write_codes,
+])
+def test_shared_frame_rejects_writes(steam_data, write):
+    with pytest.raises(ValueError):
+        write(steam_data.df)
+    assert steam_data.is_unchanged()
+
+
+def test_derived_frames_are_private(steam_data):
+    df = steam_data.df
+    # Turunan milik session boleh diubah tanpa menyentuh data bersama
+    subset = df[df['price'] > 0]
+    subset['price'] = 0.0
+    copy = df.copy()
+    copy['positive_ratings'] += 1
+    column = df['price']
+    column.iloc[0] = -1.0
+    assert (df['price'] >= 0).all()
+    assert steam_data.is_unchanged()
+
+
+def test_shared_arrays_are_read_only(steam_data):
+    arrays = []
+    for index in steam_data.dimensions.values():
+        arrays += [index.codes, index.offsets, index.labels]
+    for group in (steam_data.cube.per_year, steam_data.cube.unknown, steam_data.cube.cum):
+        arrays += [arr for arr in group.values() if isinstance(arr, np.ndarray)]
+    arrays += list(steam_data.bitmaps.bitsets())
+    arrays += [steam_data.top_k.years, steam_data.top_k.rows, steam_data.top_k.scores]
+    for arr in arrays:
+        if arr.size:
+            with pytest.raises(ValueError):
+                arr.flat[0] = arr.flat[0]
+    assert steam_data.is_unchanged()
+
+
+def test_app_sessions_leave_shared_data_unchanged(games, write_csv, monkeypatch):
+    monkeypatch.setenv('STEAM_DASHBOARD_DATA', write_csv(games(600, seed=3)))
+    monkeypatch.setenv('STEAM_DASHBOARD_APPROX_ROWS', '200')
+    monkeypatch.setenv('STEAM_DASHBOARD_POLL_SECONDS', '3600')
+
+    def selectbox(label):
+        return next(s for s in at.selectbox if s.label == label)
+
+    def run():
+        at.run()
+        assert not at.exception, at.exception
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.query_params['debug'] = '1'
+    run()
+    for approximate in (False, True):
+        at.sidebar.toggle[0].set_value(approximate)
+        for period in [*PERIODS, CUSTOM_PERIOD]:
+            selectbox('Periode Waktu:').select(period)
+            run()
+            if period == CUSTOM_PERIOD:
+                slider = at.sidebar.slider[0]
+                slider.set_value((slider.min, min(slider.min + 3, slider.max)))
+                run()
+            for price_category in selectbox('Pilih Kategori Harga:').options:
+                selectbox('Pilih Kategori Harga:').select(price_category)
+                run()
+            for genre in selectbox('Pilih Genre:').options:
+                selectbox('Pilih Genre:').select(genre)
+                run()
+
+    captions = [caption.value for caption in at.sidebar.caption]
+    assert 'Data bersama utuh (fingerprint cocok)' in captions
+    assert not at.sidebar.error
+
+
+@pytest.mark.parametrize('release_date', ['2016-03-03', 'bogus'])
+def test_custom_period_with_single_year(games, write_csv, monkeypatch, release_date):
+    # Semua game satu tahun rilis (atau tahun tidak diketahui): tanpa slider
+    df = games(200, seed=4)
+    df['release_date'] = release_date
+    monkeypatch.setenv('STEAM_DASHBOARD_DATA', write_csv(df))
+    monkeypatch.setenv('STEAM_DASHBOARD_POLL_SECONDS', '3600')
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    at.sidebar.selectbox[0].select(CUSTOM_PERIOD)
+    at.run()
+    assert not at.exception, at.exception
+    assert not at.sidebar.slider
@@ -0,0 +1,20 @@
+import ingest
+from watcher import DatasetWatcher
+
+
+def test_delta_swap_reports_its_own_time(games, write_csv):
+    base_csv = write_csv(games(300, seed=11))
+    watcher = DatasetWatcher(base_csv)
+    watcher.load()
+    build_seconds = watcher.last_build_seconds
+    assert build_seconds is not None
+    assert not watcher.poll()
+
+    ingest.add_delta(base_csv, write_csv(games(20, seed=12), 'delta.csv'))
+    assert watcher.poll()
+    stats = watcher.stats()
+    assert stats['deltas'] == 1 and stats['swaps'] == 1
+    assert stats['last_swap'] == 'delta'
+    assert stats['last_delta_seconds'] is not None
+    # Swap delta tidak membangun ulang, jadi waktu build penuh tidak berubah
+    assert stats['last_build_seconds'] == build_seconds